@@ -1,34 +1,40 @@
-import importlib
-import json
+import asyncio
+import hashlib
 import logging
-from typing import Annotated, Optional, TypedDict
+import re
+from copy import copy
+from typing import Annotated, AsyncGenerator, Optional
+from urllib.parse import quote
 
+import orjson
+import yaml
 from aiogram import Bot
 from aiogram.exceptions import TelegramConflictError, TelegramUnauthorizedError
 from aiogram.utils.token import TokenValidationError
-from cdp import CdpClient, EvmServerAccount
+from cachetools import TTLCache
+from cdp import EvmServerAccount
 from fastapi import (
     APIRouter,
     Body,
     Depends,
     File,
+    Header,
     HTTPException,
     Path,
     Query,
     Response,
     UploadFile,
 )
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field, ValidationError
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.exc import NoResultFound
-from yaml import safe_load
 
+from intentkit.clients.cdp import get_origin_cdp_client
 from intentkit.clients.twitter import unlink_twitter
 from intentkit.config.config import config
-from intentkit.core.engine import clean_agent_memory
+from intentkit.core.engine import clean_agent_memory, invalidate_agent
 from intentkit.models.agent import (
     Agent,
     AgentCreate,
@@ -36,12 +42,12 @@ from intentkit.models.agent import (
     AgentTable,
     AgentUpdate,
 )
-from intentkit.models.agent_data import AgentData, AgentDataTable
-from intentkit.models.db import get_db
+from intentkit.models.agent_data import AgentData
+from intentkit.models.db import get_session
 from intentkit.models.user import User
-from intentkit.skills import __all__ as skill_categories
+from intentkit.skills import get_skill_registry
 from intentkit.utils.middleware import create_jwt_middleware
-from intentkit.utils.slack_alert import send_slack_message
+from intentkit.utils.slack_alert import send_slack_message_async
 
 admin_router_readonly = APIRouter()
 admin_router = APIRouter()
@@ -51,6 +57,24 @@ verify_jwt = create_jwt_middleware(config.admin_auth_enabled, config.admin_jwt_s
 
 logger = logging.getLogger(__name__)
 
+# Number of agents loaded from the database per batch when listing agents
+_AGENTS_BATCH_SIZE = 100
+# Keep references to fire-and-forget tasks so they are not garbage collected
+_background_tasks: set[asyncio.Task] = set()
+# Maximum size of an uploaded agent YAML file in bytes
+_IMPORT_MAX_SIZE = 1024 * 1024
+# libyaml backed safe loader when available, much faster than SafeLoader
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Telegram bot token format, checked before creating a Bot
+_TG_TOKEN_RE = re.compile(r"\d+:[A-Za-z0-9_-]{35,}")
+# Telegram bot info by sha256 of the bot token, saves a get_me call and a new
+# http session when the same token is submitted again
+_telegram_bot_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
+# Bound concurrent CDP account creations to stay within CDP rate limits
+_cdp_semaphore = asyncio.Semaphore(config.cdp_max_concurrency)
+# Bound the number of agent responses built concurrently, each one may hit redis
+_agents_semaphore = asyncio.Semaphore(config.admin_agents_concurrency)
+
 
 async def _process_agent(
     agent: AgentCreate, subject: str | None = None, slack_message: str | None = None
@@ -79,27 +103,36 @@ async def _process_agent(
 
 
 async def _process_agent_post_actions(
-    agent: Agent, is_new: bool = True, slack_message: str | None = None
+    agent: Agent,
+    is_new: bool = True,
+    slack_message: str | None = None,
+    data_updates: dict | None = None,
 ) -> AgentData:
     """Process common actions after agent creation or update.
 
+    All agent data changes, including the given data_updates, are written with
+    a single upsert at the end.
+
     Args:
         agent: The agent that was created or updated
         is_new: Whether the agent is newly created
         slack_message: Optional custom message for Slack notification
+        data_updates: Optional agent data fields to save, such as telegram info
 
     Returns:
         AgentData: The processed agent data
     """
     has_wallet = False
     agent_data = None
+    wallet_data = {}
+    data_updates = dict(data_updates or {})
 
     if not is_new:
         # Get agent data
         agent_data = await AgentData.get(agent.id)
         if agent_data and agent_data.cdp_wallet_data:
             has_wallet = True
-            wallet_data = json.loads(agent_data.cdp_wallet_data)
+            wallet_data = orjson.loads(agent_data.cdp_wallet_data)
         # Run clean_agent_memory in background
         # asyncio.create_task(clean_agent_memory(agent.id, clean_agent=True))
 
@@ -113,32 +146,22 @@ async def _process_agent_post_actions(
         try:
             network_id = agent.network_id or agent.cdp_network_id
 
-            async with CdpClient(
-                api_key_id=config.cdp_api_key_id,
-                api_key_secret=config.cdp_api_key_secret,
-            ) as cdp:
-                # Create a new account
+            # Create a new account with the shared client
+            cdp = get_origin_cdp_client()
+            async with _cdp_semaphore:
                 account: EvmServerAccount = await cdp.evm.create_account()
 
-                # Export account data - use model_dump to get account data
-                account_data = account.model_dump()
-
-                # Create wallet_data structure that's compatible with existing code
-                wallet_data = {
-                    "account_data": account_data,
-                    "default_address_id": account.address,
-                    "network_id": network_id,
-                }
+            # Export account data - use model_dump to get account data
+            account_data = account.model_dump()
 
-            # Save or update AgentData with the new wallet information
-            if not agent_data:
-                agent_data = AgentData(
-                    id=agent.id, cdp_wallet_data=json.dumps(wallet_data)
-                )
-            else:
-                agent_data.cdp_wallet_data = json.dumps(wallet_data)
+            # Create wallet_data structure that's compatible with existing code
+            wallet_data = {
+                "account_data": account_data,
+                "default_address_id": account.address,
+                "network_id": network_id,
+            }
 
-            await agent_data.save()
+            data_updates["cdp_wallet_data"] = orjson.dumps(wallet_data).decode()
             logger.info("Account created for agent %s: %s", agent.id, account.address)
 
         except Exception as e:
@@ -149,56 +172,90 @@ async def _process_agent_post_actions(
                 "network_id": network_id,
             }
 
-    # Send Slack notification
+    # Save all agent data changes in one round trip
+    if data_updates:
+        agent_data = await AgentData.upsert(agent.id, **data_updates)
+    elif not agent_data:
+        agent_data = AgentData.model_construct(id=agent.id)
+
+    # Send Slack notification in the background, it must not delay the response
     slack_message = slack_message or ("Agent Created" if is_new else "Agent Updated")
-    try:
+    task = asyncio.create_task(
         _send_agent_notification(agent, agent_data, wallet_data, slack_message)
-    except Exception as e:
-        logger.error("Failed to send Slack notification: %s", e)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
     return agent_data
 
 
+def _requested_telegram_token(agent: AgentUpdate) -> Optional[str]:
+    """Get the telegram bot token a request enables, if any.
+
+    Args:
+        agent: The agent create or update request
+
+    Returns:
+        Optional[str]: The bot token, None if the request does not enable telegram
+    """
+    # Check the fields set in the request without dumping the whole model
+    fields_set = agent.model_fields_set
+    if (
+        "telegram_entrypoint_enabled" not in fields_set
+        or not agent.telegram_entrypoint_enabled
+        or "telegram_config" not in fields_set
+        or not agent.telegram_config
+    ):
+        return None
+    return agent.telegram_config.get("token") or None
+
+
 async def _process_telegram_config(
-    agent: AgentUpdate, existing_agent: Optional[Agent], agent_data: AgentData
-) -> AgentData:
+    agent: AgentUpdate, existing_agent: Optional[Agent]
+) -> dict:
     """Process telegram configuration for an agent.
 
     Args:
         agent: The agent with telegram configuration
-        agent_data: The agent data to update
+        existing_agent: The agent before this change, None for new agents
 
     Returns:
-        AgentData: The updated agent data
+        dict: Agent data fields to update, empty if nothing changed
     """
-    changes = agent.model_dump(exclude_unset=True)
-    if not changes.get("telegram_entrypoint_enabled"):
-        return agent_data
+    tg_bot_token = _requested_telegram_token(agent)
+    if not tg_bot_token:
+        return {}
 
-    if not changes.get("telegram_config") or not changes.get("telegram_config").get(
-        "token"
+    if (
+        existing_agent
+        and (existing_agent.telegram_config or {}).get("token") == tg_bot_token
     ):
-        return agent_data
+        return {}
 
-    tg_bot_token = changes.get("telegram_config").get("token")
+    if not _TG_TOKEN_RE.fullmatch(tg_bot_token):
+        logger.warning("Invalid telegram bot token format")
+        return {}
 
-    if existing_agent and existing_agent.telegram_config.get("token") == tg_bot_token:
-        return agent_data
+    # Reuse the bot info fetched recently for the same token
+    cache_key = hashlib.sha256(tg_bot_token.encode()).hexdigest()
+    cached = _telegram_bot_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
 
     try:
-        bot = Bot(token=tg_bot_token)
-        bot_info = await bot.get_me()
-        agent_data.telegram_id = str(bot_info.id)
-        agent_data.telegram_username = bot_info.username
-        agent_data.telegram_name = bot_info.first_name
+        # The context manager closes the bot's http session when done
+        async with Bot(token=tg_bot_token) as bot:
+            bot_info = await bot.get_me()
+        telegram_name = bot_info.first_name
         if bot_info.last_name:
-            agent_data.telegram_name = f"{bot_info.first_name} {bot_info.last_name}"
-        await agent_data.save()
-        try:
-            await bot.close()
-        except Exception:
-            pass
-        return agent_data
+            telegram_name = f"{bot_info.first_name} {bot_info.last_name}"
+        telegram_data = {
+            "telegram_id": str(bot_info.id),
+            "telegram_username": bot_info.username,
+            "telegram_name": telegram_name,
+        }
+        _telegram_bot_cache[cache_key] = telegram_data
+        return dict(telegram_data)
     except (
         TelegramUnauthorizedError,
         TelegramConflictError,
@@ -207,25 +264,49 @@ async def _process_telegram_config(
         logger.error(
             f"Unauthorized err getting telegram bot username with token {tg_bot_token}: {req_err}",
         )
-        return agent_data
+        return {}
     except Exception as e:
         logger.error(
             f"Error getting telegram bot username with token {tg_bot_token}: {e}",
         )
-        return agent_data
+        return {}
 
 
-def _send_agent_notification(
+async def _send_agent_notification(
     agent: Agent, agent_data: AgentData, wallet_data: dict, message: str
 ) -> None:
     """Send a notification about agent creation or update.
 
+    Runs as a background task, so errors are logged instead of raised.
+
     Args:
         agent: The agent that was created or updated
         agent_data: The agent data to update
         wallet_data: The agent's wallet data
         message: The notification message
     """
+    try:
+        await send_slack_message_async(
+            message,
+            attachments=_agent_notification_attachments(agent, agent_data, wallet_data),
+        )
+    except Exception as e:
+        logger.error("Failed to send Slack notification: %s", e)
+
+
+def _agent_notification_attachments(
+    agent: Agent, agent_data: AgentData, wallet_data: dict
+) -> list[dict]:
+    """Build the Slack attachments describing an agent.
+
+    Args:
+        agent: The agent that was created or updated
+        agent_data: The agent data
+        wallet_data: The agent's wallet data
+
+    Returns:
+        list[dict]: Slack message attachments
+    """
     # Format autonomous configurations - show only enabled ones with their id, name, and schedule
     autonomous_formatted = ""
     if agent.autonomous:
@@ -277,52 +358,49 @@ def _send_agent_notification(
     else:
         skills_formatted = "None"
 
-    send_slack_message(
-        message,
-        attachments=[
-            {
-                "color": "good",
-                "fields": [
-                    {"title": "Number", "short": True, "value": agent.number},
-                    {"title": "ID", "short": True, "value": agent.id},
-                    {"title": "Name", "short": True, "value": agent.name},
-                    {"title": "Model", "short": True, "value": agent.model},
-                    {
-                        "title": "Network",
-                        "short": True,
-                        "value": agent.network_id or agent.cdp_network_id or "Default",
-                    },
-                    {
-                        "title": "X Username",
-                        "short": True,
-                        "value": agent_data.twitter_username,
-                    },
-                    {
-                        "title": "Telegram Enabled",
-                        "short": True,
-                        "value": str(agent.telegram_entrypoint_enabled),
-                    },
-                    {
-                        "title": "Telegram Username",
-                        "short": True,
-                        "value": agent_data.telegram_username,
-                    },
-                    {
-                        "title": "Wallet Address",
-                        "value": wallet_data.get("default_address_id"),
-                    },
-                    {
-                        "title": "Autonomous",
-                        "value": autonomous_formatted,
-                    },
-                    {
-                        "title": "Skills",
-                        "value": skills_formatted,
-                    },
-                ],
-            }
-        ],
-    )
+    return [
+        {
+            "color": "good",
+            "fields": [
+                {"title": "Number", "short": True, "value": agent.number},
+                {"title": "ID", "short": True, "value": agent.id},
+                {"title": "Name", "short": True, "value": agent.name},
+                {"title": "Model", "short": True, "value": agent.model},
+                {
+                    "title": "Network",
+                    "short": True,
+                    "value": agent.network_id or agent.cdp_network_id or "Default",
+                },
+                {
+                    "title": "X Username",
+                    "short": True,
+                    "value": agent_data.twitter_username,
+                },
+                {
+                    "title": "Telegram Enabled",
+                    "short": True,
+                    "value": str(agent.telegram_entrypoint_enabled),
+                },
+                {
+                    "title": "Telegram Username",
+                    "short": True,
+                    "value": agent_data.telegram_username,
+                },
+                {
+                    "title": "Wallet Address",
+                    "value": wallet_data.get("default_address_id"),
+                },
+                {
+                    "title": "Autonomous",
+                    "value": autonomous_formatted,
+                },
+                {
+                    "title": "Skills",
+                    "value": skills_formatted,
+                },
+            ],
+        }
+    ]
 
 
 @admin_router.post(
@@ -361,10 +439,11 @@ async def create_or_update_agent(
     agent_response = await AgentResponse.from_agent(latest_agent, agent_data)
 
     # Return Response with ETag header
+    content, etag = agent_response.to_response()
     return Response(
-        content=agent_response.model_dump_json(),
+        content=content,
         media_type="application/json",
-        headers={"ETag": agent_response.etag()},
+        headers={"ETag": etag},
     )
 
 
@@ -492,25 +571,31 @@ async def create_agent(
     if existing:
         agent_data = await AgentData.get(existing.id)
         agent_response = await AgentResponse.from_agent(existing, agent_data)
+        content, etag = agent_response.to_response()
         return Response(
             status_code=200,
-            content=agent_response.model_dump_json(),
+            content=content,
             media_type="application/json",
-            headers={"ETag": agent_response.etag()},
+            headers={"ETag": etag},
         )
     # Create new agent
     latest_agent = await agent.create()
-    # Process common post-creation actions
-    agent_data = await _process_agent_post_actions(latest_agent, True, "Agent Created")
-    agent_data = await _process_telegram_config(input, None, agent_data)
+    telegram_data = await _process_telegram_config(input, None)
+    # Process common post-creation actions, the wallet is created before the
+    # response so nothing can use the agent without it, the Slack notification
+    # is sent in the background
+    agent_data = await _process_agent_post_actions(
+        latest_agent, True, "Agent Created", telegram_data
+    )
     agent_response = await AgentResponse.from_agent(latest_agent, agent_data)
 
     # Return Response with ETag header
+    content, etag = agent_response.to_response()
     return Response(
         status_code=201,
-        content=agent_response.model_dump_json(),
+        content=content,
         media_type="application/json",
-        headers={"ETag": agent_response.etag()},
+        headers={"ETag": etag},
     )
 
 
@@ -545,25 +630,32 @@ async def update_agent(
     if subject:
         agent.owner = subject
 
-    existing_agent = await Agent.get(agent_id)
-    if not existing_agent:
-        raise HTTPException(status_code=404, detail="Agent not found")
+    # The previous agent is only needed to compare telegram tokens, otherwise
+    # the update alone checks that the agent exists
+    telegram_data = {}
+    if _requested_telegram_token(agent):
+        existing_agent = await Agent.get(agent_id)
+        if not existing_agent:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        telegram_data = await _process_telegram_config(agent, existing_agent)
 
     # Update agent
     latest_agent = await agent.update(agent_id)
+    invalidate_agent(agent_id)
 
     # Process common post-update actions
-    agent_data = await _process_agent_post_actions(latest_agent, False, "Agent Updated")
-
-    agent_data = await _process_telegram_config(agent, existing_agent, agent_data)
+    agent_data = await _process_agent_post_actions(
+        latest_agent, False, "Agent Updated", telegram_data
+    )
 
     agent_response = await AgentResponse.from_agent(latest_agent, agent_data)
 
     # Return Response with ETag header
+    content, etag = agent_response.to_response()
     return Response(
-        content=agent_response.model_dump_json(),
+        content=content,
         media_type="application/json",
-        headers={"ETag": agent_response.etag()},
+        headers={"ETag": etag},
     )
 
 
@@ -601,62 +693,126 @@ async def override_agent(
     if not agent.owner:
         raise HTTPException(status_code=400, detail="Owner is required")
 
-    existing_agent = await Agent.get(agent_id)
-    if not existing_agent:
-        raise HTTPException(status_code=404, detail="Agent not found")
+    # The previous agent is only needed to compare telegram tokens, otherwise
+    # the override alone checks that the agent exists
+    telegram_data = {}
+    if _requested_telegram_token(agent):
+        existing_agent = await Agent.get(agent_id)
+        if not existing_agent:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        telegram_data = await _process_telegram_config(agent, existing_agent)
 
     # Update agent
     latest_agent = await agent.override(agent_id)
+    invalidate_agent(agent_id)
 
     # Process common post-update actions
     agent_data = await _process_agent_post_actions(
-        latest_agent, False, "Agent Overridden"
+        latest_agent, False, "Agent Overridden", telegram_data
     )
 
-    agent_data = await _process_telegram_config(agent, existing_agent, agent_data)
-
     agent_response = await AgentResponse.from_agent(latest_agent, agent_data)
 
     # Return Response with ETag header
+    content, etag = agent_response.to_response()
     return Response(
-        content=agent_response.model_dump_json(),
+        content=content,
         media_type="application/json",
-        headers={"ETag": agent_response.etag()},
+        headers={"ETag": etag},
     )
 
 
+class AgentsResponse(BaseModel):
+    """Response model for agents with pagination."""
+
+    data: list[AgentResponse] = Field(description="List of agents")
+    has_more: bool = Field(description="Indicates if there are more items")
+    next_cursor: Optional[str] = Field(None, description="Cursor for next page")
+
+
 @admin_router_readonly.get(
     "/agents",
     tags=["Agent"],
     dependencies=[Depends(verify_jwt)],
     operation_id="get_agents",
+    response_model=AgentsResponse,
 )
-async def get_agents(db: AsyncSession = Depends(get_db)) -> list[AgentResponse]:
-    """Get all agents with their quota information.
+async def get_agents(
+    limit: Annotated[
+        int, Query(ge=1, le=200, description="Max number of agents to return")
+    ] = 50,
+    cursor: Annotated[
+        Optional[str],
+        Query(description="Only return agents after this ID, for pagination"),
+    ] = None,
+) -> StreamingResponse:
+    """Get agents with their quota information, a page at a time.
+
+    Agents are ordered by ID. While `has_more` is true, pass `next_cursor` as
+    `cursor` to get the next page.
+
+    The page is streamed, agents are read from the database in batches instead
+    of loading them all first.
+
+    **Query Parameters:**
+    * `limit` - Max number of agents to return, 50 by default and at most 200
+    * `cursor` - Optional agent ID, only agents after it are returned
 
     **Returns:**
-    * `list[AgentResponse]` - List of agents with their quota information and additional processed data
+    * `AgentsResponse` - Agents with their quota information and additional processed data, and the cursor of the next page
     """
-    # Query all agents first
-    agents = (await db.scalars(select(AgentTable))).all()
+    stmt = select(AgentTable).order_by(AgentTable.id)
+    if cursor:
+        stmt = stmt.where(AgentTable.id > cursor)
+    # One extra row tells whether there is a next page
+    stmt = stmt.limit(limit + 1)
+    return StreamingResponse(_stream_agents(stmt, limit), media_type="application/json")
+
+
+async def _stream_agents(stmt: Select, limit: int) -> AsyncGenerator[bytes, None]:
+    """Yield up to limit agents selected by stmt as an AgentsResponse, one batch at a time."""
+    yield b'{"data":['
+    first = True
+    count = 0
+    has_more = False
+    last_id = None
+    # The session is opened here rather than injected, because dependencies are
+    # closed before a streaming response body is sent.
+    async with get_session() as db:
+        result = await db.stream_scalars(
+            stmt.execution_options(yield_per=_AGENTS_BATCH_SIZE)
+        )
+        async for agents in result.partitions():
+            if count + len(agents) > limit:
+                has_more = True
+                agents = agents[: limit - count]
+                if not agents:
+                    break
+            count += len(agents)
+            last_id = agents[-1].id
+            # Batch get agent data
+            agent_data_map = await AgentData.get_many([agent.id for agent in agents])
+            agent_responses = await asyncio.gather(
+                *[
+                    _bounded_agent_response(agent, agent_data_map.get(agent.id))
+                    for agent in agents
+                ]
+            )
+            for agent_response in agent_responses:
+                if not first:
+                    yield b","
+                first = False
+                yield orjson.dumps(agent_response.model_dump(mode="json"))
+    yield b'],"has_more":' + orjson.dumps(has_more)
+    yield b',"next_cursor":' + orjson.dumps(last_id if has_more else None) + b"}"
 
-    # Batch get agent data
-    agent_ids = [agent.id for agent in agents]
-    agent_data_list = await db.scalars(
-        select(AgentDataTable).where(AgentDataTable.id.in_(agent_ids))
-    )
-    agent_data_map = {data.id: data for data in agent_data_list}
 
-    # Convert to AgentResponse objects
-    return [
-        await AgentResponse.from_agent(
-            Agent.model_validate(agent),
-            AgentData.model_validate(agent_data_map.get(agent.id))
-            if agent.id in agent_data_map
-            else None,
-        )
-        for agent in agents
-    ]
+async def _bounded_agent_response(
+    agent: AgentTable, agent_data: Optional[AgentData]
+) -> AgentResponse:
+    """Build an AgentResponse while holding the shared agents semaphore."""
+    async with _agents_semaphore:
+        return await AgentResponse.from_agent(Agent.from_table(agent), agent_data)
 
 
 @admin_router_readonly.get(
@@ -667,12 +823,16 @@ async def get_agents(db: AsyncSession = Depends(get_db)) -> list[AgentResponse]:
 )
 async def get_agent(
     agent_id: str = Path(..., description="ID of the agent to retrieve"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
 ) -> Response:
     """Get a single agent by ID.
 
     **Path Parameters:**
     * `agent_id` - ID of the agent to retrieve
 
+    **Headers:**
+    * `If-None-Match` - ETag of a cached copy, answered with 304 when unchanged
+
     **Returns:**
     * `AgentResponse` - Agent configuration with additional processed data
 
@@ -680,23 +840,43 @@ async def get_agent(
     * `HTTPException`:
         - 404: Agent not found
     """
-    agent = await Agent.get(agent_id)
+    # Get agent and agent data in one query
+    agent, agent_data = await Agent.get_with_data(agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
-    # Get agent data
-    agent_data = await AgentData.get(agent_id)
-
     agent_response = await AgentResponse.from_agent(agent, agent_data)
 
-    # Return Response with ETag header
+    # Return Response with ETag header, without a body if the client has it
+    content, etag = agent_response.to_response()
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
     return Response(
-        content=agent_response.model_dump_json(),
+        content=content,
         media_type="application/json",
-        headers={"ETag": agent_response.etag()},
+        headers={"ETag": etag},
     )
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against the current ETag.
+
+    Args:
+        if_none_match: Value of the If-None-Match header, if any
+        etag: Current ETag of the resource
+
+    Returns:
+        bool: True if the client copy is still current
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/").strip('"') == etag:
+            return True
+    return False
+
+
 class MemCleanRequest(BaseModel):
     """Request model for agent memory cleanup endpoint.
 
@@ -806,84 +986,37 @@ async def export_agent(
         agent.skills = {}
 
     # Process all skill categories
-    for category in skill_categories:
-        try:
-            # Dynamically import the skill module
-            skill_module = importlib.import_module(f"intentkit.skills.{category}")
-
-            # Check if the module has a Config class and get_skills function
-            if hasattr(skill_module, "Config") and hasattr(skill_module, "get_skills"):
-                # Get or create the config for this category
-                category_config = agent.skills.get(category, {})
-
-                # Ensure 'enabled' field exists (required by SkillConfig)
-                if "enabled" not in category_config:
-                    category_config["enabled"] = False
-
-                # Ensure states dict exists
-                if "states" not in category_config:
-                    category_config["states"] = {}
-
-                # Get all available skill states from the module
-                available_skills = []
-                if hasattr(skill_module, "SkillStates") and hasattr(
-                    skill_module.SkillStates, "__annotations__"
-                ):
-                    available_skills = list(
-                        skill_module.SkillStates.__annotations__.keys()
-                    )
-                # Add missing skills with disabled state
-                for skill_name in available_skills:
-                    if skill_name not in category_config["states"]:
-                        category_config["states"][skill_name] = "disabled"
-
-                # Get all required fields from Config class and its base classes
-                config_class = skill_module.Config
-                # Get all base classes of Config
-                all_bases = [config_class]
-                for base in config_class.__mro__[1:]:
-                    if base is TypedDict or base is dict or base is object:
-                        continue
-                    all_bases.append(base)
-
-                # Collect all required fields from Config and its base classes
-                for base in all_bases:
-                    if hasattr(base, "__annotations__"):
-                        for field_name, field_type in base.__annotations__.items():
-                            # Skip fields already set or marked as NotRequired
-                            if field_name in category_config or "NotRequired" in str(
-                                field_type
-                            ):
-                                continue
-                            # Add default value based on type
-                            if field_name != "states":  # states already handled above
-                                if "str" in str(field_type):
-                                    category_config[field_name] = ""
-                                elif "bool" in str(field_type):
-                                    category_config[field_name] = False
-                                elif "int" in str(field_type):
-                                    category_config[field_name] = 0
-                                elif "float" in str(field_type):
-                                    category_config[field_name] = 0.0
-                                elif "list" in str(field_type) or "List" in str(
-                                    field_type
-                                ):
-                                    category_config[field_name] = []
-                                elif "dict" in str(field_type) or "Dict" in str(
-                                    field_type
-                                ):
-                                    category_config[field_name] = {}
-
-                # Update the agent's skills config
-                agent.skills[category] = category_config
-        except (ImportError, AttributeError):
-            # Skip if module import fails or doesn't have required components
-            pass
-    yaml_content = agent.to_yaml()
-    return Response(
-        content=yaml_content,
+    for category, skill_meta in get_skill_registry().items():
+        # Get or create the config for this category
+        category_config = agent.skills.get(category, {})
+
+        # Ensure 'enabled' field exists (required by SkillConfig)
+        if "enabled" not in category_config:
+            category_config["enabled"] = False
+
+        # Ensure states dict exists
+        if "states" not in category_config:
+            category_config["states"] = {}
+
+        # Add missing skills with disabled state
+        for skill_name in skill_meta.available_skills:
+            if skill_name not in category_config["states"]:
+                category_config["states"][skill_name] = "disabled"
+
+        # Add missing required fields with their default values
+        for field_name, default in skill_meta.config_defaults.items():
+            if field_name not in category_config:
+                category_config[field_name] = copy(default)
+
+        # Update the agent's skills config
+        agent.skills[category] = category_config
+    # Starlette iterates the sync generator in its thread pool
+    return StreamingResponse(
+        agent.iter_yaml(),
         media_type="application/x-yaml",
-        headers={"Content-Disposition": f'attachment; filename="{agent_id}.yaml"'},
+        headers={
+            "Content-Disposition": f'attachment; filename="{quote(agent_id)}.yaml"'
+        },
     )
 
 
@@ -916,17 +1049,25 @@ async def import_agent(
     * `HTTPException`:
         - 400: Invalid YAML or agent configuration
         - 404: Agent not found
+        - 413: YAML file too large
         - 500: Server error
     """
-    # First check if agent exists
-    existing_agent = await Agent.get(agent_id)
-    if not existing_agent:
-        raise HTTPException(status_code=404, detail="Agent not found")
-
-    # Read and parse YAML
-    content = await file.read()
+    # Reject oversized uploads before parsing them
+    size = file.size
+    if size is None:
+        size = 0
+        await file.seek(0)
+        while chunk := await file.read(65536):
+            size += len(chunk)
+            if size > _IMPORT_MAX_SIZE:
+                break
+    if size > _IMPORT_MAX_SIZE:
+        raise HTTPException(status_code=413, detail="YAML file too large")
+
+    # Parse YAML straight from the spooled upload without buffering it first
+    await file.seek(0)
     try:
-        yaml_data = safe_load(content)
+        yaml_data = await asyncio.to_thread(yaml.load, file.file, Loader=_YAML_LOADER)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid YAML format: {e}")
 
@@ -936,16 +1077,24 @@ async def import_agent(
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=f"Invalid agent configuration: {e}")
 
-    # Get the latest agent from create_or_update
+    # The previous agent is only needed to compare telegram tokens, otherwise
+    # the update alone checks that the agent exists
+    telegram_data = {}
+    if _requested_telegram_token(agent):
+        existing_agent = await Agent.get(agent_id)
+        if not existing_agent:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        telegram_data = await _process_telegram_config(agent, existing_agent)
+
+    # Update agent
     latest_agent = await agent.update(agent_id)
+    invalidate_agent(agent_id)
 
     # Process common post-creation/update steps
-    agent_data = await _process_agent_post_actions(
-        latest_agent, False, "Agent Updated via YAML Import"
+    await _process_agent_post_actions(
+        latest_agent, False, "Agent Updated via YAML Import", telegram_data
     )
 
-    await _process_telegram_config(agent, existing_agent, agent_data)
-
     return "Agent import successful"
 
 
@@ -978,8 +1127,10 @@ async def unlink_twitter_endpoint(
 
     agent_response = await AgentResponse.from_agent(agent, agent_data)
 
+    content, etag = agent_response.to_response()
+
     return Response(
-        content=agent_response.model_dump_json(),
+        content=content,
         media_type="application/json",
-        headers={"ETag": agent_response.etag()},
+        headers={"ETag": etag},
     )
@@ -32,6 +32,7 @@ from app.entrypoints.openai_compatible import openai_router
 from app.entrypoints.web import chat_router, chat_router_readonly
 from app.services.twitter.oauth2 import router as twitter_oauth2_router
 from app.services.twitter.oauth2_callback import router as twitter_callback_router
+from intentkit.clients.cdp import close_origin_cdp_client
 from intentkit.config.config import config
 from intentkit.core.api import core_router
 from intentkit.models.agent import AgentTable
@@ -89,6 +90,7 @@ async def lifespan(app: FastAPI):
     yield
     # Clean up will run after the API server shutdown
     logger.info("Cleaning up and shutdown...")
+    await close_origin_cdp_client()
 
 
 app = FastAPI(
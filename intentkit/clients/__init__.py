@@ -1,14 +1,25 @@
-from intentkit.clients.cdp import CdpClient, get_cdp_client
+from intentkit.clients.cdp import (
+    CdpClient,
+    close_origin_cdp_client,
+    get_cdp_client,
+    get_origin_cdp_client,
+    release_cdp_client,
+)
 from intentkit.clients.twitter import (
     TwitterClient,
     TwitterClientConfig,
     get_twitter_client,
+    release_twitter_client,
 )
 
 __all__ = [
     "TwitterClient",
     "TwitterClientConfig",
     "get_twitter_client",
+    "release_twitter_client",
     "CdpClient",
     "get_cdp_client",
+    "get_origin_cdp_client",
+    "close_origin_cdp_client",
+    "release_cdp_client",
 ]
@@ -2,6 +2,7 @@ import json
 import logging
 from typing import Dict, Optional
 
+from cdp import CdpClient as OriginCdpClient
 from cdp import EvmServerAccount
 from coinbase_agentkit import (
     CdpEvmServerWalletProvider,
@@ -9,10 +10,12 @@ from coinbase_agentkit import (
 )
 
 from intentkit.abstracts.skill import SkillStoreABC
+from intentkit.config.config import config
 from intentkit.models.agent import Agent
 from intentkit.models.agent_data import AgentData
 
 _clients: Dict[str, "CdpClient"] = {}
+_origin_cdp_client: Optional[OriginCdpClient] = None
 
 
 class CdpClient:
@@ -90,3 +93,38 @@ async def get_cdp_client(agent_id: str, skill_store: SkillStoreABC) -> "CdpClien
     if agent_id not in _clients:
         _clients[agent_id] = CdpClient(agent_id, skill_store)
     return _clients[agent_id]
+
+
+def release_cdp_client(agent_id: str) -> None:
+    """Drop the cached CDP client of an agent.
+
+    The wallet provider opens a CDP session per call, so there is nothing to
+    close, the next get_cdp_client builds a new client from the stored wallet.
+    """
+    _clients.pop(agent_id, None)
+
+
+def get_origin_cdp_client() -> OriginCdpClient:
+    """Get the shared CDP SDK client, created on first use.
+
+    The client keeps its HTTP session open, so callers must not close it or use
+    it as a context manager. Call close_origin_cdp_client on shutdown.
+
+    Returns:
+        OriginCdpClient: The shared CDP SDK client
+    """
+    global _origin_cdp_client
+    if _origin_cdp_client is None:
+        _origin_cdp_client = OriginCdpClient(
+            api_key_id=config.cdp_api_key_id,
+            api_key_secret=config.cdp_api_key_secret,
+        )
+    return _origin_cdp_client
+
+
+async def close_origin_cdp_client() -> None:
+    """Close the shared CDP SDK client if it was created."""
+    global _origin_cdp_client
+    if _origin_cdp_client is not None:
+        await _origin_cdp_client.close()
+        _origin_cdp_client = None
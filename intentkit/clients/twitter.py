@@ -422,24 +422,34 @@ def get_twitter_client(
     agent_id: str, skill_store: SkillStoreABC, config: Dict
 ) -> "TwitterClient":
     if _is_self_key(config):
-        if agent_id not in _clients_self_key:
-            _clients_self_key[agent_id] = TwitterClient(agent_id, skill_store, config)
-        return _clients_self_key[agent_id]
+        client = _clients_self_key.get(agent_id)
+        # rebuild the client when the owner changes the keys
+        if not client or client._config != config:
+            client = TwitterClient(agent_id, skill_store, config)
+            _clients_self_key[agent_id] = client
+        return client
     if agent_id not in _clients_linked:
         _clients_linked[agent_id] = TwitterClient(agent_id, skill_store, config)
     return _clients_linked[agent_id]
 
 
+def release_twitter_client(agent_id: str) -> None:
+    """Drop the cached Twitter clients of an agent.
+
+    tweepy opens an HTTP session per request, so there is nothing to close.
+    """
+    _clients_linked.pop(agent_id, None)
+    _clients_self_key.pop(agent_id, None)
+
+
 async def unlink_twitter(agent_id: str) -> AgentData:
     logger.info(f"Unlinking Twitter for agent {agent_id}")
-    return await AgentData.patch(
+    return await AgentData.upsert(
         agent_id,
-        {
-            "twitter_id": None,
-            "twitter_username": None,
-            "twitter_name": None,
-            "twitter_access_token": None,
-            "twitter_access_token_expires_at": None,
-            "twitter_refresh_token": None,
-        },
+        twitter_id=None,
+        twitter_username=None,
+        twitter_name=None,
+        twitter_access_token=None,
+        twitter_access_token_expires_at=None,
+        twitter_refresh_token=None,
     )
@@ -59,6 +59,19 @@ class Config:
             }
         # ==== this part can be load from env or aws secrets manager
         self.db["auto_migrate"] = self.load("DB_AUTO_MIGRATE", "true") == "true"
+        self.db["pool_size"] = int(self.load("DB_POOL_SIZE", "20"))
+        self.db["max_overflow"] = int(self.load("DB_MAX_OVERFLOW", "30"))
+        self.db["pool_timeout"] = int(self.load("DB_POOL_TIMEOUT", "60"))
+        self.db["pool_recycle"] = int(self.load("DB_POOL_RECYCLE", "3600"))
+        self.db["pool_pre_ping"] = self.load("DB_POOL_PRE_PING", "true") == "true"
+        # set to true when connecting through pgbouncer in transaction mode
+        self.db["null_pool"] = self.load("DB_NULL_POOL", "false") == "true"
+        self.db["checkpoint_pool_min_size"] = int(
+            self.load("DB_CHECKPOINT_POOL_MIN_SIZE", "3")
+        )
+        self.db["checkpoint_pool_max_size"] = int(
+            self.load("DB_CHECKPOINT_POOL_MAX_SIZE", "20")
+        )
         self.debug = self.load("DEBUG") == "true"
         self.debug_checkpoint = (
             self.load("DEBUG_CHECKPOINT", "false") == "true"
@@ -79,6 +92,12 @@ class Config:
         self.admin_llm_skill_control = (
             self.load("ADMIN_LLM_SKILL_CONTROL", "false") == "true"
         )
+        self.agent_cache_size = int(
+            self.load("AGENT_CACHE_SIZE", "256")
+        )  # max agent executors kept in memory per mode
+        self.admin_agents_concurrency = int(
+            self.load("ADMIN_AGENTS_CONCURRENCY", "20")
+        )  # max agents built concurrently when listing agents
         # Payment
         self.payment_enabled = self.load("PAYMENT_ENABLED", "false") == "true"
         # Open API for agent
@@ -87,6 +106,9 @@ class Config:
         self.cdp_api_key_id = self.load("CDP_API_KEY_ID")
         self.cdp_api_key_secret = self.load("CDP_API_KEY_SECRET")
         self.cdp_wallet_secret = self.load("CDP_WALLET_SECRET")
+        self.cdp_max_concurrency = int(
+            self.load("CDP_MAX_CONCURRENCY", "8")
+        )  # max concurrent CDP account creations
         # LLM providers
         self.openai_api_key = self.load("OPENAI_API_KEY")
         self.deepseek_api_key = self.load("DEEPSEEK_API_KEY")
@@ -10,16 +10,17 @@ This module provides functionality for initializing and executing AI agents. It
 The module uses a global cache to store initialized agents for better performance.
 """
 
+import asyncio
 import importlib
 import logging
 import re
-import textwrap
 import time
 import traceback
-from datetime import datetime
 from typing import Optional
+from weakref import WeakValueDictionary
 
 import sqlalchemy
+from cachetools import LRUCache, TTLCache
 from epyxid import XID
 from fastapi import HTTPException
 from langchain_core.messages import (
@@ -36,6 +37,7 @@ from sqlalchemy import func, update
 from sqlalchemy.exc import SQLAlchemyError
 
 from intentkit.abstracts.graph import AgentError, AgentState
+from intentkit.clients import release_cdp_client, release_twitter_client
 from intentkit.config.config import config
 from intentkit.core.credit import expense_message, expense_skill
 from intentkit.core.node import PreModelNode, post_model_node
@@ -60,6 +62,21 @@ from intentkit.utils.error import IntentKitAPIError
 logger = logging.getLogger(__name__)
 
 
+def _preview(text: str, width: int = 1000) -> str:
+    """Cut text to at most width characters, ending with "..." when cut.
+
+    Args:
+        text (str): The text to shorten
+        width (int): Maximum length of the result
+
+    Returns:
+        str: The shortened text
+    """
+    if len(text) <= width:
+        return text
+    return text[: width - 3] + "..."
+
+
 async def explain_prompt(message: str) -> str:
     """
     Process message to replace @skill:*:* patterns with (call skill xxxxx) format.
@@ -98,13 +115,109 @@ async def explain_prompt(message: str) -> str:
     return result
 
 
-# Global variable to cache all agent executors
-_agents: dict[str, CompiledStateGraph] = {}
-_private_agents: dict[str, CompiledStateGraph] = {}
+class _AgentExecutorCache(LRUCache):
+    """LRU cache of agent executors that releases the agent's clients on eviction."""
+
+    def popitem(self):
+        agent_id, value = super().popitem()
+        # the other mode may still hold an executor that uses the same clients
+        if agent_id not in _agents and agent_id not in _private_agents:
+            release_cdp_client(agent_id)
+            release_twitter_client(agent_id)
+        return agent_id, value
+
+
+# Agent executors with the agent updated_at they were built from, the least
+# recently used ones are dropped when the cache is full
+_agents: LRUCache = _AgentExecutorCache(maxsize=config.agent_cache_size)
+_private_agents: LRUCache = _AgentExecutorCache(maxsize=config.agent_cache_size)
+
+# One lock per (agent id, private mode) so concurrent cold starts build the
+# executor once, entries go away when no coroutine holds the lock
+_init_locks: WeakValueDictionary = WeakValueDictionary()
+
+# Agents read on every chat message, kept for a few seconds to save a query
+# per turn, invalidate_agent drops an entry right after a config change
+_agent_cache: TTLCache = TTLCache(maxsize=1024, ttl=5)
+
+# Escape curly braces in a single pass, for text used in ChatPromptTemplate
+_BRACE_ESCAPE = str.maketrans({"{": "{{", "}": "}}"})
+
+# Escaped system prompts by (agent id, agent updated_at, agent data updated_at),
+# shared by the public and private executors of the same agent
+_escaped_prompts: LRUCache = LRUCache(maxsize=512)
+
+
+def _escaped_agent_prompt(agent: Agent, agent_data: Optional[AgentData]) -> str:
+    """Build the system prompt of an agent with curly braces escaped.
+
+    Args:
+        agent (Agent): Agent configuration object
+        agent_data (Optional[AgentData]): Agent data, for the account details
+
+    Returns:
+        str: The escaped system prompt
+    """
+    key = (agent.id, agent.updated_at, agent_data.updated_at if agent_data else None)
+    prompt = _escaped_prompts.get(key)
+    if prompt is None:
+        prompt = agent_prompt(agent, agent_data).translate(_BRACE_ESCAPE)
+        _escaped_prompts[key] = prompt
+    return prompt
+
+
+async def _load_skill_tools(
+    category: str, skill_config: dict, is_private: bool, agent_id: str
+) -> list[BaseTool]:
+    """Load the tools of one skill category.
+
+    Args:
+        category (str): Skill category, the module name under intentkit.skills
+        skill_config (dict): The agent's config for this category
+        is_private (bool): Whether the agent is private
+        agent_id (str): Agent ID
+
+    Returns:
+        list[BaseTool]: Tools of the category, empty if it can not be loaded
+    """
+    try:
+        skill_module = importlib.import_module(f"intentkit.skills.{category}")
+        if not hasattr(skill_module, "get_skills"):
+            logger.error(f"Skill {category} does not have get_skills function")
+            return []
+        skill_tools = await skill_module.get_skills(
+            skill_config, is_private, skill_store, agent_id=agent_id
+        )
+        return skill_tools or []
+    except ImportError as e:
+        logger.error(f"Could not import skill module: {category} ({e})")
+        return []
+
+
+async def _get_agent(agent_id: str) -> Optional[Agent]:
+    """Get an agent, served from the short lived agent cache when possible.
+
+    Args:
+        agent_id (str): Agent ID
+
+    Returns:
+        Optional[Agent]: The agent, None if not found
+    """
+    agent = _agent_cache.get(agent_id)
+    if agent is None:
+        agent = await Agent.get(agent_id)
+        if agent:
+            _agent_cache[agent_id] = agent
+    return agent
+
+
+def invalidate_agent(agent_id: str) -> None:
+    """Drop an agent from the agent cache, call it after changing its config.
 
-# Global dictionaries to cache agent update times
-_agents_updated: dict[str, datetime] = {}
-_private_agents_updated: dict[str, datetime] = {}
+    Args:
+        agent_id (str): Agent ID
+    """
+    _agent_cache.pop(agent_id, None)
 
 
 async def create_agent(
@@ -149,27 +262,23 @@ async def create_agent(
     memory = get_langgraph_checkpointer()
 
     # ==== Load skills
-    tools: list[BaseTool | dict] = []
+    # keyed by name, so a duplicate tool replaces the earlier one in place
+    tools_by_name: dict[str, BaseTool] = {}
 
     if agent.skills:
-        for k, v in agent.skills.items():
-            if not v.get("enabled", False):
-                continue
-            try:
-                skill_module = importlib.import_module(f"intentkit.skills.{k}")
-                if hasattr(skill_module, "get_skills"):
-                    skill_tools = await skill_module.get_skills(
-                        v, is_private, skill_store, agent_id=agent.id
-                    )
-                    if skill_tools and len(skill_tools) > 0:
-                        tools.extend(skill_tools)
-                else:
-                    logger.error(f"Skill {k} does not have get_skills function")
-            except ImportError as e:
-                logger.error(f"Could not import skill module: {k} ({e})")
+        # Skill categories are independent, load them concurrently
+        results = await asyncio.gather(
+            *(
+                _load_skill_tools(k, v, is_private, agent.id)
+                for k, v in agent.skills.items()
+                if v.get("enabled", False)
+            )
+        )
+        for skill_tools in results:
+            for tool in skill_tools:
+                tools_by_name[tool.name] = tool
 
-    # filter the duplicate tools
-    tools = list({tool.name: tool for tool in tools}.values())
+    tools: list[BaseTool | dict] = list(tools_by_name.values())
 
     # Add search tools if requested
     if (
@@ -180,9 +289,7 @@ async def create_agent(
         tools.append({"type": "web_search_preview"})
 
     # finally, set up the system prompt
-    prompt = agent_prompt(agent, agent_data)
-    # Escape curly braces in the prompt
-    escaped_prompt = prompt.replace("{", "{{").replace("}", "}}")
+    escaped_prompt = _escaped_agent_prompt(agent, agent_data)
     # Process message to handle @skill patterns
     if config.admin_llm_skill_control:
         escaped_prompt = await explain_prompt(escaped_prompt)
@@ -192,7 +299,7 @@ async def create_agent(
     ]
     if agent.prompt_append:
         # Escape any curly braces in prompt_append
-        escaped_append = agent.prompt_append.replace("{", "{{").replace("}", "}}")
+        escaped_append = agent.prompt_append.translate(_BRACE_ESCAPE)
         # Process message to handle @skill patterns
         if config.admin_llm_skill_control:
             escaped_append = await explain_prompt(escaped_append)
@@ -273,17 +380,18 @@ async def create_agent(
     return executor
 
 
-async def initialize_agent(aid, is_private=False):
+async def initialize_agent(aid, is_private=False, agent: Optional[Agent] = None):
     """Initialize an AI agent with specified configuration and tools.
 
     This function:
-    1. Loads agent configuration from database
+    1. Loads agent configuration from database, unless it is passed in
     2. Uses create_agent to build the agent
     3. Caches the agent
 
     Args:
         aid (str): Agent ID to initialize
         is_private (bool, optional): Flag indicating whether the agent is private. Defaults to False.
+        agent (Agent, optional): Agent configuration already loaded by the caller. Defaults to None.
 
     Returns:
         Agent: Initialized LangChain agent
@@ -292,63 +400,51 @@ async def initialize_agent(aid, is_private=False):
         HTTPException: If agent not found (404) or database error (500)
     """
     # get the agent from the database
-    agent: Optional[Agent] = await Agent.get(aid)
+    if agent is None:
+        agent = await Agent.get(aid)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
-    # Determine if search should be enabled based on model capabilities
-    from intentkit.models.llm import create_llm_model
-
-    llm_model = await create_llm_model(
-        model_name=agent.model,
-        temperature=agent.temperature,
-        frequency_penalty=agent.frequency_penalty,
-        presence_penalty=agent.presence_penalty,
-    )
-    has_search = (
-        llm_model.info.provider == LLMProvider.OPENAI and llm_model.info.supports_search
-    )
-
-    # Create the agent using the new create_agent function
-    executor = await create_agent(agent, is_private, has_search)
+    # Create the agent using the new create_agent function, it only adds the
+    # search tool when the model supports it
+    executor = await create_agent(agent, is_private, has_search=True)
 
     # Cache the agent executor
-    if is_private:
-        _private_agents[aid] = executor
-        _private_agents_updated[aid] = agent.updated_at
-    else:
-        _agents[aid] = executor
-        _agents_updated[aid] = agent.updated_at
+    agents = _private_agents if is_private else _agents
+    agents[aid] = (executor, agent.updated_at)
+    return executor
 
 
 async def agent_executor(
-    agent_id: str, is_private: bool
+    agent_id: str, is_private: bool, agent: Optional[Agent] = None
 ) -> (CompiledStateGraph, float):
     start = time.perf_counter()
-    agent = await Agent.get(agent_id)
+    if agent is None:
+        agent = await _get_agent(agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
     agents = _private_agents if is_private else _agents
-    agents_updated = _private_agents_updated if is_private else _agents_updated
 
-    # Check if agent needs reinitialization due to updates
-    needs_reinit = False
-    if agent_id in agents:
-        if (
-            agent_id not in agents_updated
-            or agent.updated_at != agents_updated[agent_id]
-        ):
-            needs_reinit = True
+    cached = agents.get(agent_id)
+    if cached and cached[1] == agent.updated_at:
+        return cached[0], 0.0
+
+    lock = _init_locks.get((agent_id, is_private))
+    if lock is None:
+        lock = _init_locks[(agent_id, is_private)] = asyncio.Lock()
+    async with lock:
+        # another request may have built it while we were waiting
+        cached = agents.get(agent_id)
+        if cached and cached[1] == agent.updated_at:
+            return cached[0], time.perf_counter() - start
+        if cached:
             logger.info(
                 f"Reinitializing agent {agent_id} due to updates, private mode: {is_private}"
             )
 
-    # cold start or needs reinitialization
-    cold_start_cost = 0.0
-    if (agent_id not in agents) or needs_reinit:
-        await initialize_agent(agent_id, is_private)
-        cold_start_cost = time.perf_counter() - start
-    return agents[agent_id], cold_start_cost
+        # cold start or needs reinitialization
+        executor = await initialize_agent(agent_id, is_private, agent)
+    return executor, time.perf_counter() - start
 
 
 async def stream_agent(message: ChatMessageCreate):
@@ -375,7 +471,7 @@ async def stream_agent(message: ChatMessageCreate):
     input = await message.save()
 
     # agent
-    agent = await Agent.get(input.agent_id)
+    agent = await _get_agent(input.agent_id)
 
     # model
     model = await LLMModelInfo.get(agent.model)
@@ -471,7 +567,7 @@ async def stream_agent(message: ChatMessageCreate):
     if input.user_id == agent.owner:
         is_private = True
 
-    executor, cold_start_cost = await agent_executor(input.agent_id, is_private)
+    executor, cold_start_cost = await agent_executor(input.agent_id, is_private, agent)
     last = start + cold_start_cost
 
     # Extract images from attachments
@@ -553,12 +649,16 @@ async def stream_agent(message: ChatMessageCreate):
             "app_id": input.app_id,
             "entrypoint": input.author_type,
             "payer": payer if payment_enabled else None,
+            # skill data read or saved by skills during this run
+            "skill_data_cache": {},
         },
         "recursion_limit": recursion_limit,
     }
 
     # run
     cached_tool_step = None
+    # position and call of each tool call in cached_tool_step, by call id
+    cached_calls_by_id: dict[str, tuple[int, dict]] = {}
     try:
         async for chunk in executor.astream({"messages": messages}, stream_config):
             this_time = time.perf_counter()
@@ -570,11 +670,16 @@ async def stream_agent(message: ChatMessageCreate):
                         extra={"thread_id": thread_id},
                     )
                 msg = chunk["agent"]["messages"][0]
-                if hasattr(msg, "tool_calls") and msg.tool_calls:
+                if getattr(msg, "tool_calls", None):
                     # tool calls, save for later use, if it is deleted by post_model_hook, will not be used.
                     cached_tool_step = msg
-                if hasattr(msg, "content") and msg.content:
+                    cached_calls_by_id = {
+                        call["id"]: (call_index, call)
+                        for call_index, call in enumerate(msg.tool_calls)
+                    }
+                if getattr(msg, "content", None):
                     content = msg.content
+                    usage = getattr(msg, "usage_metadata", None) or {}
                     if isinstance(msg.content, list):
                         # in new version, content item maybe a list
                         content = msg.content[0]
@@ -596,16 +701,8 @@ async def stream_agent(message: ChatMessageCreate):
                         thread_type=input.author_type,
                         reply_to=input.id,
                         message=content,
-                        input_tokens=(
-                            msg.usage_metadata.get("input_tokens", 0)
-                            if hasattr(msg, "usage_metadata") and msg.usage_metadata
-                            else 0
-                        ),
-                        output_tokens=(
-                            msg.usage_metadata.get("output_tokens", 0)
-                            if hasattr(msg, "usage_metadata") and msg.usage_metadata
-                            else 0
-                        ),
+                        input_tokens=usage.get("input_tokens", 0),
+                        output_tokens=usage.get("output_tokens", 0),
                         time_cost=this_time - last,
                     )
                     last = this_time
@@ -622,10 +719,7 @@ async def stream_agent(message: ChatMessageCreate):
                             )
 
                             # Check for web_search_call in additional_kwargs
-                            if (
-                                hasattr(msg, "additional_kwargs")
-                                and msg.additional_kwargs
-                            ):
+                            if getattr(msg, "additional_kwargs", None):
                                 tool_outputs = msg.additional_kwargs.get(
                                     "tool_outputs", []
                                 )
@@ -668,28 +762,32 @@ async def stream_agent(message: ChatMessageCreate):
                             extra={"thread_id": thread_id},
                         )
                         continue
-                    for call_index, call in enumerate(cached_tool_step.tool_calls):
-                        if call["id"] == msg.tool_call_id:
-                            if call_index == 0:
-                                have_first_call_in_cache = True
-                            skill_call: ChatMessageSkillCall = {
-                                "id": msg.tool_call_id,
-                                "name": call["name"],
-                                "parameters": call["args"],
-                                "success": True,
-                            }
-                            if msg.status == "error":
-                                skill_call["success"] = False
-                                skill_call["error_message"] = str(msg.content)
-                            else:
-                                if config.debug:
-                                    skill_call["response"] = str(msg.content)
-                                else:
-                                    skill_call["response"] = textwrap.shorten(
-                                        str(msg.content), width=1000, placeholder="..."
-                                    )
-                            skill_calls.append(skill_call)
-                            break
+                    cached_call = cached_calls_by_id.get(msg.tool_call_id)
+                    if not cached_call:
+                        continue
+                    call_index, call = cached_call
+                    if call_index == 0:
+                        have_first_call_in_cache = True
+                    skill_call: ChatMessageSkillCall = {
+                        "id": msg.tool_call_id,
+                        "name": call["name"],
+                        "parameters": call["args"],
+                        "success": True,
+                    }
+                    if msg.status == "error":
+                        skill_call["success"] = False
+                        skill_call["error_message"] = str(msg.content)
+                    else:
+                        if config.debug:
+                            skill_call["response"] = str(msg.content)
+                        else:
+                            skill_call["response"] = _preview(str(msg.content))
+                    skill_calls.append(skill_call)
+                usage = (
+                    getattr(cached_tool_step, "usage_metadata", None) or {}
+                    if have_first_call_in_cache
+                    else {}
+                )
                 skill_message_create = ChatMessageCreate(
                     id=str(XID()),
                     agent_id=input.agent_id,
@@ -702,20 +800,8 @@ async def stream_agent(message: ChatMessageCreate):
                     reply_to=input.id,
                     message="",
                     skill_calls=skill_calls,
-                    input_tokens=(
-                        cached_tool_step.usage_metadata.get("input_tokens", 0)
-                        if hasattr(cached_tool_step, "usage_metadata")
-                        and cached_tool_step.usage_metadata
-                        and have_first_call_in_cache
-                        else 0
-                    ),
-                    output_tokens=(
-                        cached_tool_step.usage_metadata.get("output_tokens", 0)
-                        if hasattr(cached_tool_step, "usage_metadata")
-                        and cached_tool_step.usage_metadata
-                        and have_first_call_in_cache
-                        else 0
-                    ),
+                    input_tokens=usage.get("input_tokens", 0),
+                    output_tokens=usage.get("output_tokens", 0),
                     time_cost=this_time - last,
                 )
                 last = this_time
@@ -916,6 +1002,26 @@ async def execute_agent(message: ChatMessageCreate) -> list[ChatMessage]:
     return resp
 
 
+# Delete the checkpoints, writes and blobs of matching threads in one statement
+_DELETE_CHECKPOINTS_TEMPLATE = """
+    WITH deleted_checkpoints AS (
+        DELETE FROM checkpoints WHERE {predicate}
+    ), deleted_writes AS (
+        DELETE FROM checkpoint_writes WHERE {predicate}
+    )
+    DELETE FROM checkpoint_blobs WHERE {predicate}
+"""
+# A single thread, equality can seek the thread_id primary key prefix
+_DELETE_THREAD_CHECKPOINTS_SQL = sqlalchemy.text(
+    _DELETE_CHECKPOINTS_TEMPLATE.format(predicate="thread_id = :value")
+)
+# All threads of an agent, a range predicate is not used here because with a
+# non C collation punctuation like "-" does not sort by code point
+_DELETE_AGENT_CHECKPOINTS_SQL = sqlalchemy.text(
+    _DELETE_CHECKPOINTS_TEMPLATE.format(predicate="thread_id LIKE :value")
+)
+
+
 async def clean_agent_memory(
     agent_id: str,
     chat_id: str = "",
@@ -956,29 +1062,16 @@ async def clean_agent_memory(
         async with get_session() as db:
             if clean_agent:
                 chat_id = chat_id.strip()
-                q_suffix = "%"
-                if chat_id and chat_id != "":
-                    q_suffix = chat_id
-
-                deletion_param = {"value": agent_id + "-" + q_suffix}
-                await db.execute(
-                    sqlalchemy.text(
-                        "DELETE FROM checkpoints WHERE thread_id like :value",
-                    ),
-                    deletion_param,
-                )
-                await db.execute(
-                    sqlalchemy.text(
-                        "DELETE FROM checkpoint_writes WHERE thread_id like :value",
-                    ),
-                    deletion_param,
-                )
-                await db.execute(
-                    sqlalchemy.text(
-                        "DELETE FROM checkpoint_blobs WHERE thread_id like :value",
-                    ),
-                    deletion_param,
-                )
+                # one round trip for all three checkpoint tables
+                if chat_id:
+                    await db.execute(
+                        _DELETE_THREAD_CHECKPOINTS_SQL,
+                        {"value": f"{agent_id}-{chat_id}"},
+                    )
+                else:
+                    await db.execute(
+                        _DELETE_AGENT_CHECKPOINTS_SQL, {"value": f"{agent_id}-%"}
+                    )
 
             # update the updated_at field so that the agent instance will all reload
             await db.execute(
@@ -987,6 +1080,7 @@ async def clean_agent_memory(
                 .values(updated_at=func.now())
             )
             await db.commit()
+        invalidate_agent(agent_id)
 
         logger.info(f"Agent [{agent_id}] data cleaned up successfully.")
         return "Agent data cleaned up successfully."
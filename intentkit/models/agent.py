@@ -1,16 +1,17 @@
-import json
+import hashlib
 import logging
 import re
 import textwrap
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Annotated, Any, Dict, List, Literal, Optional
+from typing import Annotated, Any, Dict, Iterator, List, Literal, Optional
 
+import orjson
 import yaml
 from cron_validator import CronValidator
 from epyxid import XID
 from fastapi import HTTPException
-from intentkit.models.agent_data import AgentData
+from intentkit.models.agent_data import AgentData, AgentDataTable
 from intentkit.models.base import Base
 from intentkit.models.db import get_session
 from intentkit.models.llm import LLMModelInfo
@@ -27,7 +28,9 @@ from sqlalchemy import (
     Numeric,
     String,
     func,
+    or_,
     select,
+    update,
 )
 from sqlalchemy.dialects.postgresql import JSON, JSONB
 
@@ -987,47 +990,64 @@ class AgentUpdate(BaseModel):
 
     async def update(self, id: str) -> "Agent":
         # Validate autonomous schedule settings if present
-        if "autonomous" in self.model_dump(exclude_unset=True):
+        changes = self.model_dump(exclude_unset=True)
+        if "autonomous" in changes:
             self.validate_autonomous_schedule()
 
-        async with get_session() as db:
-            db_agent = await db.get(AgentTable, id)
-            if not db_agent:
-                raise HTTPException(status_code=404, detail="Agent not found")
-            # check owner
-            if self.owner and db_agent.owner != self.owner:
-                raise HTTPException(
-                    status_code=403,
-                    detail="You do not have permission to update this agent",
-                )
-            # update
-            for key, value in self.model_dump(exclude_unset=True).items():
-                setattr(db_agent, key, value)
-            await db.commit()
-            await db.refresh(db_agent)
-            return Agent.model_validate(db_agent)
+        # check owner
+        owner_check = AgentTable.owner == self.owner if self.owner else None
+        return await self._update_returning(id, changes, owner_check)
 
     async def override(self, id: str) -> "Agent":
         # Validate autonomous schedule settings if present
-        if "autonomous" in self.model_dump(exclude_unset=True):
+        if "autonomous" in self.model_fields_set:
             self.validate_autonomous_schedule()
 
+        # check owner, agents without owner can be taken over
+        owner_check = or_(
+            AgentTable.owner.is_(None),
+            AgentTable.owner == "",
+            AgentTable.owner == self.owner,
+        )
+        return await self._update_returning(id, self.model_dump(), owner_check)
+
+    @staticmethod
+    async def _update_returning(id: str, values: dict, owner_check) -> "Agent":
+        """Update an agent row and read it back with a single UPDATE ... RETURNING.
+
+        Args:
+            id: ID of the agent to update
+            values: Column values to set
+            owner_check: Optional condition the current row must match
+
+        Returns:
+            Agent: The updated agent
+
+        Raises:
+            HTTPException: 404 if the agent does not exist, 403 if owner_check fails
+        """
         async with get_session() as db:
-            db_agent = await db.get(AgentTable, id)
-            if not db_agent:
-                raise HTTPException(status_code=404, detail="Agent not found")
-            # check owner
-            if db_agent.owner and db_agent.owner != self.owner:
+            if not values:
+                db_agent = await db.get(AgentTable, id)
+                if not db_agent:
+                    raise HTTPException(status_code=404, detail="Agent not found")
+                return Agent.model_validate(db_agent)
+            stmt = update(AgentTable).where(AgentTable.id == id)
+            if owner_check is not None:
+                stmt = stmt.where(owner_check)
+            db_agent = await db.scalar(stmt.values(**values).returning(AgentTable))
+            if db_agent is None:
+                # Nothing updated, find out why, this only runs on the error path
+                if await db.get(AgentTable, id) is None:
+                    raise HTTPException(status_code=404, detail="Agent not found")
                 raise HTTPException(
                     status_code=403,
                     detail="You do not have permission to update this agent",
                 )
-            # update
-            for key, value in self.model_dump().items():
-                setattr(db_agent, key, value)
+            # Validate before commit so a row that fails validation is rolled back
+            agent = Agent.model_validate(db_agent)
             await db.commit()
-            await db.refresh(db_agent)
-            return Agent.model_validate(db_agent)
+            return agent
 
 
 class AgentCreate(AgentUpdate):
@@ -1169,8 +1189,18 @@ class Agent(AgentCreate):
         Returns:
             str: YAML representation of the agent with field descriptions as comments
         """
-        data = {}
-        yaml_lines = []
+        return "".join(self.iter_yaml())
+
+    def iter_yaml(self) -> Iterator[str]:
+        """
+        Dump the agent model to YAML format one field at a time.
+        Same output as to_yaml, for streaming it without building the whole
+        document in memory.
+
+        Yields:
+            str: YAML of one field, with its comments and a trailing newline
+        """
+        first = True
 
         def wrap_text(text: str, width: int = 80, prefix: str = "# ") -> list[str]:
             """Wrap text to specified width, preserving existing line breaks."""
@@ -1204,11 +1234,11 @@ class Agent(AgentCreate):
             if is_deprecated and not value:
                 continue
 
-            data[field_name] = value
+            yaml_lines = []
             # Add comment from field description if available
             description = field.description
             if description:
-                if len(yaml_lines) > 0:  # Add blank line between fields
+                if not first:  # Add blank line between fields
                     yaml_lines.append("")
                 # Split and wrap description into multiple lines
                 yaml_lines.extend(wrap_text(description))
@@ -1255,7 +1285,9 @@ class Agent(AgentCreate):
                 model_dicts = [item.model_dump(exclude_none=True) for item in value]
                 # Dump the list of dicts
                 yaml_value = yaml.dump(
-                    model_dicts, default_flow_style=False, allow_unicode=True
+                    model_dicts,
+                    default_flow_style=False,
+                    allow_unicode=True,
                 )
                 # Indent all lines and append to yaml_lines
                 indented_yaml = "\n".join(
@@ -1285,7 +1317,32 @@ class Agent(AgentCreate):
                     )
                     yaml_lines.append(yaml_value.rstrip())
 
-        return "\n".join(yaml_lines) + "\n"
+            first = False
+            yield "\n".join(yaml_lines) + "\n"
+
+    @classmethod
+    def from_table(cls, item: AgentTable) -> "Agent":
+        """Build an Agent from a database row without validating it again.
+
+        Only use this for rows read from the database, which were validated when
+        they were written. Nested models are built the same way.
+
+        Args:
+            item: Agent database row
+
+        Returns:
+            Agent: The agent
+        """
+        data = {name: getattr(item, name) for name in cls.model_fields}
+        if data.get("autonomous"):
+            data["autonomous"] = [
+                AgentAutonomous.model_construct(**auto) for auto in data["autonomous"]
+            ]
+        if data.get("examples"):
+            data["examples"] = [
+                AgentExample.model_construct(**example) for example in data["examples"]
+            ]
+        return cls.model_construct(**data)
 
     @staticmethod
     async def count() -> int:
@@ -1300,6 +1357,33 @@ class Agent(AgentCreate):
                 return None
             return cls.model_validate(item)
 
+    @classmethod
+    async def get_with_data(
+        cls, agent_id: str
+    ) -> tuple[Optional["Agent"], Optional[AgentData]]:
+        """Get an agent and its agent data in a single query.
+
+        Args:
+            agent_id: Agent ID
+
+        Returns:
+            tuple: (agent, agent data), agent is None if not found, agent data is
+                None if the agent has no data yet
+        """
+        async with get_session() as db:
+            row = (
+                await db.execute(
+                    select(AgentTable, AgentDataTable)
+                    .outerjoin(AgentDataTable, AgentTable.id == AgentDataTable.id)
+                    .where(AgentTable.id == agent_id)
+                )
+            ).first()
+            if row is None:
+                return None, None
+            item, data_item = row
+            agent_data = AgentData.model_validate(data_item) if data_item else None
+            return cls.model_validate(item), agent_data
+
 
 class AgentResponse(BaseModel):
     """Response model for Agent API."""
@@ -1563,13 +1647,20 @@ class AgentResponse(BaseModel):
         Returns:
             str: ETag value for the agent
         """
-        import hashlib
-        import json
+        return self.to_response()[1]
+
+    def to_response(self) -> tuple[bytes, str]:
+        """Serialize this agent response and compute its ETag in one pass.
+
+        The ETag is a BLAKE2b hash of the serialized body, so the body is only
+        serialized once per response.
 
-        # Generate hash from the entire object data using json mode to handle datetime objects
-        # Sort keys to ensure consistent ordering of dictionary keys
-        data = json.dumps(self.model_dump(mode="json"), sort_keys=True)
-        return f"{hashlib.md5(data.encode()).hexdigest()}"
+        Returns:
+            tuple[bytes, str]: JSON body and ETag value
+        """
+        # Use json mode to handle datetime objects
+        body = orjson.dumps(self.model_dump(mode="json"))
+        return body, hashlib.blake2b(body, digest_size=16).hexdigest()
 
     @classmethod
     async def from_agent(
@@ -1625,9 +1716,9 @@ class AgentResponse(BaseModel):
         cdp_wallet_address = None
         if agent_data and agent_data.cdp_wallet_data:
             try:
-                wallet_data = json.loads(agent_data.cdp_wallet_data)
+                wallet_data = orjson.loads(agent_data.cdp_wallet_data)
                 cdp_wallet_address = wallet_data.get("default_address_id")
-            except (json.JSONDecodeError, AttributeError):
+            except (orjson.JSONDecodeError, AttributeError):
                 pass
 
         # Process Twitter linked status
@@ -1662,12 +1753,11 @@ class AgentResponse(BaseModel):
                 linked_telegram_username = agent_data.telegram_username
                 linked_telegram_name = agent_data.telegram_name
 
-        accept_image_input = (
-            await agent.is_model_support_image() or agent.has_image_parser_skill()
-        )
+        # Model info lookup hits redis or the database, only do it once
+        model_support_image = await agent.is_model_support_image()
+        accept_image_input = model_support_image or agent.has_image_parser_skill()
         accept_image_input_private = (
-            await agent.is_model_support_image()
-            or agent.has_image_parser_skill(is_private=True)
+            model_support_image or agent.has_image_parser_skill(is_private=True)
         )
 
         # Add processed fields to response
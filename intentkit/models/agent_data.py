@@ -19,6 +19,8 @@ from sqlalchemy import (
     select,
 )
 from sqlalchemy.dialects.postgresql import JSON, JSONB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 logger = logging.getLogger(__name__)
 
@@ -240,6 +242,41 @@ class AgentData(BaseModel):
                 return cls.model_validate(item)
             return cls.model_construct(id=agent_id)
 
+    @classmethod
+    def from_table(cls, item: AgentDataTable) -> "AgentData":
+        """Build AgentData from a database row without validating it again.
+
+        Only use this for rows read from the database, which were validated when
+        they were written.
+
+        Args:
+            item: Agent data database row
+
+        Returns:
+            AgentData: The agent data
+        """
+        return cls.model_construct(
+            **{name: getattr(item, name) for name in cls.model_fields}
+        )
+
+    @classmethod
+    async def get_many(cls, agent_ids: list[str]) -> dict[str, "AgentData"]:
+        """Get agent data for multiple agents in a single query.
+
+        Args:
+            agent_ids: List of agent IDs
+
+        Returns:
+            Dict mapping agent ID to AgentData, agents without data are omitted
+        """
+        if not agent_ids:
+            return {}
+        async with get_session() as db:
+            items = await db.scalars(
+                select(AgentDataTable).where(AgentDataTable.id.in_(agent_ids))
+            )
+            return {item.id: cls.from_table(item) for item in items}
+
     @classmethod
     async def get_by_api_key(cls, api_key: str) -> Optional["AgentData"]:
         """Get agent data by API key.
@@ -295,6 +332,38 @@ class AgentData(BaseModel):
 
             await db.commit()
 
+    @classmethod
+    async def upsert(cls, id: str, **fields: Any) -> "AgentData":
+        """Insert or update agent data in a single round trip.
+
+        Only the given fields are written, other columns of an existing row are
+        left untouched.
+
+        Args:
+            id: ID of the agent
+            **fields: Columns to set
+
+        Returns:
+            The agent data after the write
+        """
+        if not fields:
+            return await cls.get(id)
+        async with get_session() as db:
+            insert = sqlite_insert if db.bind.dialect.name == "sqlite" else pg_insert
+            stmt = (
+                insert(AgentDataTable)
+                .values(id=id, **fields)
+                .on_conflict_do_update(
+                    index_elements=[AgentDataTable.id],
+                    set_={**fields, "updated_at": datetime.now(timezone.utc)},
+                )
+                .returning(AgentDataTable)
+            )
+            # Validate before commit so a row that fails validation is rolled back
+            agent_data = cls.model_validate(await db.scalar(stmt))
+            await db.commit()
+            return agent_data
+
     @staticmethod
     async def patch(id: str, data: dict) -> "AgentData":
         """Update agent data.
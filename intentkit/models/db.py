@@ -1,18 +1,79 @@
 from contextlib import asynccontextmanager
-from typing import Annotated, AsyncGenerator, Optional
+from typing import Annotated, AsyncGenerator, AsyncIterator, Optional
 from urllib.parse import quote_plus
+from uuid import uuid4
 
 from intentkit.models.db_mig import safe_migrate
+from intentkit.utils.serialization import json_dumps
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langgraph.types import Checkpointer
+from psycopg import AsyncCursor
+from psycopg.rows import DictRow, dict_row
 from psycopg_pool import AsyncConnectionPool
 from pydantic import Field
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool
 
 engine = None
+_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
 _langgraph_checkpointer: Optional[Checkpointer] = None
 
+# TCP keepalive so connections silently dropped by NAT or load balancers are
+# detected while idle instead of failing the next query
+_KEEPALIVE_SERVER_SETTINGS = {
+    "tcp_keepalives_idle": "60",
+    "tcp_keepalives_interval": "10",
+    "tcp_keepalives_count": "5",
+}
+_KEEPALIVE_CONNINFO = (
+    "keepalives=1&keepalives_idle=60&keepalives_interval=10&keepalives_count=5"
+)
+
+
+def _json_serializer(value) -> str:
+    """Encode JSON columns with orjson, see json_dumps for the stdlib fallback."""
+    return json_dumps(value).decode()
+
+
+class PooledAsyncPostgresSaver(AsyncPostgresSaver):
+    """AsyncPostgresSaver that does not serialize queries when backed by a pool.
+
+    The upstream saver holds a single asyncio.Lock around every cursor, which
+    is only needed when all coroutines share one connection. With a pool each
+    cursor runs on its own connection, so the lock is skipped.
+    """
+
+    @asynccontextmanager
+    async def _cursor(
+        self, *, pipeline: bool = False
+    ) -> AsyncIterator[AsyncCursor[DictRow]]:
+        if self.pipe or not isinstance(self.conn, AsyncConnectionPool):
+            async with super()._cursor(pipeline=pipeline) as cur:
+                yield cur
+            return
+        async with self.conn.connection() as conn:
+            if pipeline and self.supports_pipeline:
+                async with (
+                    conn.pipeline(),
+                    conn.cursor(binary=True, row_factory=dict_row) as cur,
+                ):
+                    yield cur
+            elif pipeline:
+                async with (
+                    conn.transaction(),
+                    conn.cursor(binary=True, row_factory=dict_row) as cur,
+                ):
+                    yield cur
+            else:
+                async with conn.cursor(binary=True, row_factory=dict_row) as cur:
+                    yield cur
+
 
 async def init_db(
     host: Optional[str],
@@ -23,6 +84,14 @@ async def init_db(
     auto_migrate: Annotated[
         bool, Field(default=True, description="Whether to run migrations automatically")
     ],
+    pool_size: int = 20,
+    max_overflow: int = 30,
+    pool_timeout: int = 60,
+    pool_recycle: int = 3600,
+    pool_pre_ping: bool = True,
+    null_pool: bool = False,
+    checkpoint_pool_min_size: int = 3,
+    checkpoint_pool_max_size: int = 20,
 ) -> None:
     """Initialize the database and handle schema updates.
 
@@ -33,45 +102,84 @@ async def init_db(
         dbname: Database name
         port: Database port (default: 5432)
         auto_migrate: Whether to run migrations automatically (default: True)
+        pool_size: SQLAlchemy connection pool size (default: 20)
+        max_overflow: Connections allowed beyond pool_size (default: 30)
+        pool_timeout: Seconds to wait for a pooled connection (default: 60)
+        pool_recycle: Seconds after which a connection is replaced (default: 3600)
+        pool_pre_ping: Check connections with a round trip on checkout (default: True)
+        null_pool: Disable SQLAlchemy pooling, required when the database is
+            fronted by PgBouncer in transaction pooling mode (default: False)
+        checkpoint_pool_min_size: Connections kept open for the langgraph
+            checkpointer (default: 3)
+        checkpoint_pool_max_size: Connection limit of the langgraph
+            checkpointer (default: 20)
     """
-    global engine, _langgraph_checkpointer
+    global engine, _sessionmaker, _langgraph_checkpointer
     # Initialize psycopg pool and AsyncPostgresSaver if not already initialized
     if _langgraph_checkpointer is None:
         if host:
             pool = AsyncConnectionPool(
-                conninfo=f"postgresql://{username}:{quote_plus(password)}@{host}:{port}/{dbname}",
-                min_size=3,
-                max_size=20,
-                timeout=60,
+                conninfo=f"postgresql://{username}:{quote_plus(password)}@{host}:{port}/{dbname}?connect_timeout=10&{_KEEPALIVE_CONNINFO}",
+                min_size=checkpoint_pool_min_size,
+                max_size=checkpoint_pool_max_size,
+                timeout=pool_timeout,
                 max_idle=30 * 60,
+                # give up on an unreachable database instead of retrying for 5 minutes
+                reconnect_timeout=30,
             )
-            _langgraph_checkpointer = AsyncPostgresSaver(pool)
+            _langgraph_checkpointer = PooledAsyncPostgresSaver(pool)
             if auto_migrate:
                 await _langgraph_checkpointer.setup()
         else:
             _langgraph_checkpointer = InMemorySaver()
     # Initialize SQLAlchemy engine with pool settings
     if engine is None:
-        if host:
+        if host and null_pool:
+            # PgBouncer transaction pooling multiplexes server connections, so
+            # client side pooling and prepared statement caching must be off
             engine = create_async_engine(
                 f"postgresql+asyncpg://{username}:{quote_plus(password)}@{host}:{port}/{dbname}",
-                pool_size=20,  # Increase pool size
-                max_overflow=30,  # Increase max overflow
-                pool_timeout=60,  # Increase timeout
-                pool_pre_ping=True,  # Enable connection health checks
-                pool_recycle=3600,  # Recycle connections after 1 hour
+                poolclass=NullPool,
+                connect_args={
+                    "statement_cache_size": 0,
+                    # unique names so statements prepared on one server
+                    # connection never clash with another client's
+                    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+                },
+                json_serializer=_json_serializer,
+            )
+        elif host:
+            engine = create_async_engine(
+                f"postgresql+asyncpg://{username}:{quote_plus(password)}@{host}:{port}/{dbname}"
+                "?prepared_statement_cache_size=500",
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_pre_ping=pool_pre_ping,
+                pool_recycle=pool_recycle,
+                connect_args={
+                    "statement_cache_size": 500,
+                    # queries here are short OLTP lookups where JIT compiling
+                    # costs more than it saves
+                    "server_settings": {**_KEEPALIVE_SERVER_SETTINGS, "jit": "off"},
+                },
+                json_serializer=_json_serializer,
             )
         else:
             engine = create_async_engine(
                 "sqlite+aiosqlite:///:memory:",
                 connect_args={"check_same_thread": False},
+                json_serializer=_json_serializer,
             )
+        _sessionmaker = async_sessionmaker(
+            engine, expire_on_commit=False, autoflush=False
+        )
         if auto_migrate:
             await safe_migrate(engine)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSession(engine) as session:
+    async with _sessionmaker() as session:
         yield session
 
 
@@ -93,11 +201,8 @@ async def get_session() -> AsyncSession:
         # session is automatically closed
         ```
     """
-    session = AsyncSession(engine)
-    try:
+    async with _sessionmaker() as session:
         yield session
-    finally:
-        await session.close()
 
 
 def get_engine() -> AsyncEngine:
@@ -6,6 +6,7 @@ from typing import Annotated, Any, Dict, Optional
 from intentkit.models.base import Base
 from intentkit.models.db import get_session
 from intentkit.models.redis import get_redis
+from intentkit.utils.serialization import json_dumps
 from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import (
     Boolean,
@@ -64,7 +65,7 @@ class AgentSkillDataCreate(BaseModel):
             Exception: If the total size would exceed the 10MB limit
         """
         # Calculate the size of the data
-        data_size = len(json.dumps(self.data).encode("utf-8"))
+        data_size = len(json_dumps(self.data))
 
         async with get_session() as db:
             # Check current total size for this agent
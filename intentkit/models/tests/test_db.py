@@ -0,0 +1,51 @@
+"""Tests for the database engine setup."""
+
+import unittest
+
+from sqlalchemy import JSON, Column, Integer, MetaData, Table, insert, select
+
+from intentkit.models import db
+from intentkit.utils.serialization import json_dumps
+
+
+class TestJsonColumns(unittest.IsolatedAsyncioTestCase):
+    """JSON columns go through the engine's json_serializer."""
+
+    async def asyncSetUp(self):
+        await db.init_db(
+            host=None,
+            username=None,
+            password=None,
+            dbname=None,
+            port="5432",
+            auto_migrate=False,
+        )
+        self.table = Table(
+            "json_round_trip",
+            MetaData(),
+            Column("id", Integer, primary_key=True),
+            Column("data", JSON),
+        )
+        async with db.get_engine().begin() as conn:
+            await conn.run_sync(self.table.create, checkfirst=True)
+
+    async def asyncTearDown(self):
+        await db.get_engine().dispose()
+
+    async def test_int_beyond_64_bit_round_trip(self):
+        # 100 ETH in wei is past the 64-bit range orjson can encode
+        data = {"amountIn": [100 * 10**18], "nested": {"big": 2**70}}
+        async with db.get_engine().begin() as conn:
+            await conn.execute(insert(self.table).values(id=1, data=data))
+            stored = await conn.scalar(
+                select(self.table.c.data).where(self.table.c.id == 1)
+            )
+        self.assertEqual(stored, data)
+
+    def test_json_dumps_falls_back_for_large_int(self):
+        self.assertEqual(json_dumps({"v": 10**20}), b'{"v":100000000000000000000}')
+        self.assertEqual(json_dumps({1: "a"}), b'{"1":"a"}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,18 @@
+import importlib
 import os
 import pkgutil
+from functools import cache
+from types import UnionType
+from typing import (
+    Annotated,
+    Any,
+    NamedTuple,
+    Optional,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 
 # Get the directory containing this __init__.py file
 package_dir = os.path.dirname(__file__)
@@ -10,3 +23,98 @@ __all__ = [
     for _, name, _ in pkgutil.iter_modules([package_dir])
     if not name.startswith("_") and not name == "base"
 ]
+
+
+class SkillMeta(NamedTuple):
+    """Static information about a skill category, derived from its module."""
+
+    available_skills: list[str]
+    """Names of all skills in the category, from SkillStates"""
+    config_defaults: dict[str, Any]
+    """Default values of the required Config fields, except enabled and states"""
+
+
+# Default values of required skill config fields, by field type
+_TYPE_DEFAULTS = {str: "", bool: False, int: 0, float: 0.0, list: [], dict: {}}
+_NO_DEFAULT = object()
+
+
+def _type_default(field_type: Any) -> Any:
+    """Get the default value for a skill config field type.
+
+    Optional and Annotated types use the default of their inner type, generic
+    aliases like List[str] use the default of their origin.
+
+    Returns:
+        The default value, or _NO_DEFAULT if the type has none
+    """
+    origin = get_origin(field_type) or field_type
+    if origin is Annotated:
+        return _type_default(get_args(field_type)[0])
+    if origin is Union or origin is UnionType:
+        args = [arg for arg in get_args(field_type) if arg is not type(None)]
+        return _type_default(args[0]) if len(args) == 1 else _NO_DEFAULT
+    if origin in _TYPE_DEFAULTS:
+        return _TYPE_DEFAULTS[origin]
+    # Nested TypedDict configs
+    if isinstance(origin, type) and issubclass(origin, dict):
+        return {}
+    return _NO_DEFAULT
+
+
+def _load_skill_meta(category: str) -> Optional[SkillMeta]:
+    """Load the skill states and config defaults of a skill category.
+
+    Returns:
+        Optional[SkillMeta]: None if the category can not be imported or has no
+            Config class or get_skills function
+    """
+    try:
+        skill_module = importlib.import_module(f"intentkit.skills.{category}")
+    except ImportError:
+        return None
+    if not hasattr(skill_module, "Config") or not hasattr(skill_module, "get_skills"):
+        return None
+
+    available_skills = []
+    if hasattr(skill_module, "SkillStates") and hasattr(
+        skill_module.SkillStates, "__annotations__"
+    ):
+        available_skills = list(skill_module.SkillStates.__annotations__.keys())
+
+    # Inherited fields are included in the resolved type hints of the TypedDict
+    config_class = skill_module.Config
+    try:
+        type_hints = get_type_hints(config_class)
+    except (NameError, TypeError):
+        type_hints = {}
+    required_keys = getattr(config_class, "__required_keys__", type_hints.keys())
+    config_defaults = {}
+    for field_name, field_type in type_hints.items():
+        # Skip fields marked as NotRequired, enabled and states are always present
+        if field_name not in required_keys or field_name in ("enabled", "states"):
+            continue
+        default = _type_default(field_type)
+        if default is not _NO_DEFAULT:
+            config_defaults[field_name] = default
+
+    return SkillMeta(available_skills, config_defaults)
+
+
+@cache
+def get_skill_registry() -> dict[str, SkillMeta]:
+    """Get the metadata of all skill categories that can be configured.
+
+    Skill modules are imported on the first call rather than with this package,
+    so importing one skill does not import all of them. The result is reused
+    for the life of the process.
+
+    Returns:
+        dict[str, SkillMeta]: Skill category name to its metadata
+    """
+    registry = {}
+    for category in __all__:
+        skill_meta = _load_skill_meta(category)
+        if skill_meta is not None:
+            registry[category] = skill_meta
+    return registry
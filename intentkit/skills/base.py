@@ -148,6 +148,52 @@ class IntentKitSkill(BaseTool):
         """
         return await self.user_rate_limit(user_id, limit, minutes, self.category)
 
+    async def get_run_skill_data(
+        self, runner_config: RunnableConfig, agent_id: str, skill: str, key: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get agent skill data, reusing what this run already read or saved.
+
+        Args:
+            runner_config: The runnable config of the current run
+            agent_id: ID of the agent
+            skill: Name of the skill the data belongs to
+            key: Data key
+
+        Returns:
+            Optional[Dict[str, Any]]: The stored data if it exists
+        """
+        cache = runner_config.get("configurable", {}).get("skill_data_cache")
+        if cache is None:
+            return await self.skill_store.get_agent_skill_data(agent_id, skill, key)
+        cache_key = (agent_id, skill, key)
+        if cache_key not in cache:
+            cache[cache_key] = await self.skill_store.get_agent_skill_data(
+                agent_id, skill, key
+            )
+        return cache[cache_key]
+
+    async def save_run_skill_data(
+        self,
+        runner_config: RunnableConfig,
+        agent_id: str,
+        skill: str,
+        key: str,
+        data: Dict[str, Any],
+    ) -> None:
+        """Save agent skill data and keep it for later reads in this run.
+
+        Args:
+            runner_config: The runnable config of the current run
+            agent_id: ID of the agent
+            skill: Name of the skill the data belongs to
+            key: Data key
+            data: Data to store
+        """
+        await self.skill_store.save_agent_skill_data(agent_id, skill, key, data)
+        cache = runner_config.get("configurable", {}).get("skill_data_cache")
+        if cache is not None:
+            cache[(agent_id, skill, key)] = data
+
     def _run(self, *args: Any, **kwargs: Any) -> Any:
         raise NotImplementedError(
             "Use _arun instead, IntentKit only supports synchronous skill calls"
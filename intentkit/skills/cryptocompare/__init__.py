@@ -24,6 +24,15 @@ _cache: dict[str, CryptoCompareBaseTool] = {}
 
 logger = logging.getLogger(__name__)
 
+_SKILL_CLASSES: dict[str, type[CryptoCompareBaseTool]] = {
+    "fetch_news": CryptoCompareFetchNews,
+    "fetch_price": CryptoCompareFetchPrice,
+    "fetch_trading_signals": CryptoCompareFetchTradingSignals,
+    "fetch_top_market_cap": CryptoCompareFetchTopMarketCap,
+    "fetch_top_exchanges": CryptoCompareFetchTopExchanges,
+    "fetch_top_volume": CryptoCompareFetchTopVolume,
+}
+
 
 class SkillStates(TypedDict):
     fetch_news: SkillState
@@ -57,21 +66,13 @@ async def get_skills(
     Returns:
         A list of CryptoCompare skills.
     """
-    available_skills = []
-
-    # Include skills based on their state
-    for skill_name, state in config["states"].items():
-        if state == "disabled":
-            continue
-        elif state == "public" or (state == "private" and is_private):
-            available_skills.append(skill_name)
-
-    # Get each skill using the cached getter
+    # Include skills based on their state, using the cached getter
     result = []
-    for name in available_skills:
-        skill = get_cryptocompare_skill(name, store)
-        if skill:
-            result.append(skill)
+    for name, state in config["states"].items():
+        if state == "public" or (state == "private" and is_private):
+            skill = get_cryptocompare_skill(name, store)
+            if skill:
+                result.append(skill)
     return result
 
 
@@ -89,42 +90,12 @@ def get_cryptocompare_skill(
         The requested CryptoCompare skill
     """
 
-    if name == "fetch_news":
-        if name not in _cache:
-            _cache[name] = CryptoCompareFetchNews(
-                skill_store=store,
-            )
-        return _cache[name]
-    elif name == "fetch_price":
-        if name not in _cache:
-            _cache[name] = CryptoCompareFetchPrice(
-                skill_store=store,
-            )
-        return _cache[name]
-    elif name == "fetch_trading_signals":
-        if name not in _cache:
-            _cache[name] = CryptoCompareFetchTradingSignals(
-                skill_store=store,
-            )
-        return _cache[name]
-    elif name == "fetch_top_market_cap":
-        if name not in _cache:
-            _cache[name] = CryptoCompareFetchTopMarketCap(
-                skill_store=store,
-            )
-        return _cache[name]
-    elif name == "fetch_top_exchanges":
-        if name not in _cache:
-            _cache[name] = CryptoCompareFetchTopExchanges(
-                skill_store=store,
-            )
-        return _cache[name]
-    elif name == "fetch_top_volume":
-        if name not in _cache:
-            _cache[name] = CryptoCompareFetchTopVolume(
-                skill_store=store,
-            )
-        return _cache[name]
-    else:
+    skill_class = _SKILL_CLASSES.get(name)
+    if skill_class is None:
         logger.warning(f"Unknown CryptoCompare skill: {name}")
         return None
+    if name not in _cache:
+        _cache[name] = skill_class(
+            skill_store=store,
+        )
+    return _cache[name]
@@ -1,5 +1,6 @@
 from typing import Optional, Type
 
+import httpx
 from cdp import EvmServerAccount
 from coinbase_agentkit import CdpEvmServerWalletProvider
 from pydantic import BaseModel, Field
@@ -12,6 +13,17 @@ from intentkit.utils.chain import ChainProvider, NetworkId
 base_url = "https://api.enso.finance"
 default_chain_id = int(NetworkId.BaseMainnet)
 
+# Shared by the Enso tools so connections to the API are kept alive between calls
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client for the Enso API, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient()
+    return _http_client
+
 
 class EnsoBaseTool(IntentKitSkill):
     """Base class for Enso tools."""
@@ -1,17 +1,38 @@
+import asyncio
 import logging
+from functools import lru_cache
 from typing import Type
+from weakref import WeakValueDictionary
 
 import httpx
+from cachetools import LRUCache, TTLCache
 from langchain.tools.base import ToolException
 from langchain_core.runnables import RunnableConfig
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from intentkit.skills.base import SkillContext
 
-from .base import EnsoBaseTool, base_url
+from .base import EnsoBaseTool, base_url, get_http_client
 
 logger = logging.getLogger(__name__)
 
+# Supported networks rarely change, responses are kept per api token for an hour
+_networks_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
+# Last response per api token with its ETag, kept past the TTL so an expired
+# entry is revalidated with If-None-Match instead of downloaded again
+_networks_etags: LRUCache = LRUCache(maxsize=256)
+# One lock per api token so concurrent cache misses share a single request
+_networks_locks: WeakValueDictionary = WeakValueDictionary()
+
+
+@lru_cache(maxsize=64)
+def _headers_for(api_token: str) -> dict:
+    """Request headers for an api token, shared between calls so do not modify."""
+    return {
+        "accept": "application/json",
+        "Authorization": f"Bearer {api_token}",
+    }
+
 
 class EnsoGetNetworksInput(BaseModel):
     """
@@ -31,6 +52,9 @@ class ConnectedNetwork(BaseModel):
     )
 
 
+_networks_adapter = TypeAdapter(list[ConnectedNetwork])
+
+
 class EnsoGetNetworksOutput(BaseModel):
     """
     Output model for retrieving networks.
@@ -61,45 +85,77 @@ class EnsoGetNetworks(EnsoBaseTool):
 
         context: SkillContext = self.context_from_config(config)
         api_token = self.get_api_token(context)
-        logger.debug(f"api_token: {api_token}")
-        headers = {
-            "accept": "application/json",
-            "Authorization": f"Bearer {api_token}",
-        }
-
-        async with httpx.AsyncClient() as client:
-            try:
-                # Send the GET request
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-
-                # Parse the response JSON into the NetworkResponse model
-                json_dict = response.json()
-
-                networks = []
-                networks_memory = {}
-                for item in json_dict:
-                    network = ConnectedNetwork(**item)
-                    networks.append(network)
-                    networks_memory[str(network.id)] = network.model_dump(
-                        exclude_none=True
+        logger.debug("api_token: %s", api_token)
+        headers = _headers_for(api_token)
+
+        cached = _networks_cache.get(api_token)
+        if cached is None:
+            lock = _networks_locks.get(api_token)
+            if lock is None:
+                lock = _networks_locks[api_token] = asyncio.Lock()
+            async with lock:
+                cached = _networks_cache.get(api_token)
+                if cached is None:
+                    previous = _networks_etags.get(api_token)
+                    etag, networks, networks_memory = await self._fetch_networks(
+                        url, headers, previous
                     )
+                    cached = (networks, networks_memory)
+                    _networks_cache[api_token] = cached
+                    if etag:
+                        _networks_etags[api_token] = (etag, networks, networks_memory)
+        networks, networks_memory = cached
+
+        # the networks are stored per agent, enso_route_shortcut reads them back
+        await self.save_run_skill_data(
+            config,
+            context.agent.id,
+            "enso_get_networks",
+            "networks",
+            networks_memory,
+        )
+
+        return EnsoGetNetworksOutput(res=networks)
+
+    async def _fetch_networks(
+        self, url: str, headers: dict, previous: tuple | None
+    ) -> tuple[str | None, list[ConnectedNetwork], dict]:
+        """
+        Request the networks from the Enso API.
+
+        Args:
+            url: The networks endpoint.
+            headers: The request headers.
+            previous: The last (etag, networks, networks_memory) for this token, if any.
 
-                await self.skill_store.save_agent_skill_data(
-                    context.agent.id,
-                    "enso_get_networks",
-                    "networks",
-                    networks_memory,
-                )
-
-                return EnsoGetNetworksOutput(res=networks)
-            except httpx.RequestError as req_err:
-                raise ToolException(
-                    f"request error from Enso API: {req_err}"
-                ) from req_err
-            except httpx.HTTPStatusError as http_err:
-                raise ToolException(
-                    f"http error from Enso API: {http_err}"
-                ) from http_err
-            except Exception as e:
-                raise ToolException(f"error from Enso API: {e}") from e
+        Returns:
+            tuple: The response ETag, the network list and the networks keyed by id for the skill store.
+        """
+        client = get_http_client()
+        if previous:
+            headers = {**headers, "If-None-Match": previous[0]}
+        try:
+            # Send the GET request
+            response = await client.get(url, headers=headers)
+            if response.status_code == 304 and previous:
+                return previous
+            response.raise_for_status()
+
+            # Parse the response JSON into the NetworkResponse model
+            json_dict = response.json()
+
+            networks = _networks_adapter.validate_python(json_dict)
+            networks_memory = {
+                str(network.id): {
+                    k: v for k, v in network.__dict__.items() if v is not None
+                }
+                for network in networks
+            }
+
+            return response.headers.get("etag"), networks, networks_memory
+        except httpx.RequestError as req_err:
+            raise ToolException(f"request error from Enso API: {req_err}") from req_err
+        except httpx.HTTPStatusError as http_err:
+            raise ToolException(f"http error from Enso API: {http_err}") from http_err
+        except Exception as e:
+            raise ToolException(f"error from Enso API: {e}") from e
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Type
 
 import httpx
@@ -191,8 +192,8 @@ class EnsoRouteShortcut(EnsoBaseTool):
         async with httpx.AsyncClient() as client:
             try:
                 network_name = None
-                networks = await self.skill_store.get_agent_skill_data(
-                    agent_id, "enso_get_networks", "networks"
+                networks = await self.get_run_skill_data(
+                    config, agent_id, "enso_get_networks", "networks"
                 )
 
                 if networks:
@@ -272,16 +273,19 @@ class EnsoRouteShortcut(EnsoBaseTool):
                     tx_data = json_dict.get("tx", {})
                     if tx_data:
                         # Send the transaction using the wallet provider
-                        tx_hash = wallet_provider.send_transaction(
+                        tx_hash = await asyncio.to_thread(
+                            wallet_provider.send_transaction,
                             {
                                 "to": tx_data.get("to"),
                                 "data": tx_data.get("data", "0x"),
                                 "value": tx_data.get("value", 0),
-                            }
+                            },
                         )
 
                         # Wait for transaction confirmation
-                        wallet_provider.wait_for_transaction_receipt(tx_hash)
+                        await asyncio.to_thread(
+                            wallet_provider.wait_for_transaction_receipt, tx_hash
+                        )
                         res.txHash = tx_hash
                     else:
                         # For now, return a placeholder transaction hash if no tx data
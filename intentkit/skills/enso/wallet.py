@@ -1,3 +1,4 @@
+import asyncio
 from typing import Literal, Tuple, Type
 
 import httpx
@@ -338,10 +339,10 @@ class EnsoWalletApprove(EnsoBaseTool):
 
         params["fromAddress"] = from_address
 
-        with httpx.Client() as client:
+        async with httpx.AsyncClient() as client:
             try:
                 # Send the GET request
-                response = client.get(url, headers=headers, params=params)
+                response = await client.get(url, headers=headers, params=params)
                 response.raise_for_status()
 
                 # Map the response JSON into the WalletApproveTransaction model
@@ -356,16 +357,19 @@ class EnsoWalletApprove(EnsoBaseTool):
                 tx_data = json_dict.get("tx", {})
                 if tx_data:
                     # Send the transaction using the wallet provider
-                    tx_hash = wallet_provider.send_transaction(
+                    tx_hash = await asyncio.to_thread(
+                        wallet_provider.send_transaction,
                         {
                             "to": tx_data.get("to"),
                             "data": tx_data.get("data", "0x"),
                             "value": tx_data.get("value", 0),
-                        }
+                        },
                     )
 
                     # Wait for transaction confirmation
-                    wallet_provider.wait_for_transaction_receipt(tx_hash)
+                    await asyncio.to_thread(
+                        wallet_provider.wait_for_transaction_receipt, tx_hash
+                    )
                     artifact.txHash = tx_hash
                 else:
                     # For now, return without executing the transaction if no tx data
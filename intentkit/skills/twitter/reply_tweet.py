@@ -61,38 +61,36 @@ class TwitterReplyTweet(TwitterBaseTool):
                 config=context.config,
             )
             client = await twitter.get_client()
+            use_key = twitter.use_key
 
             # Check rate limit only when not using OAuth
-            if not twitter.use_key:
+            if not use_key:
                 await self.check_rate_limit(
                     context.agent.id, max_requests=48, interval=1440
                 )
 
             media_ids = []
 
-            # Handle image upload if provided
+            # Handle image upload if provided, only once the rate limit allows
+            # the reply so a rejected call never uploads anything
             if image:
                 # Use the TwitterClient method to upload the image
                 media_ids = await twitter.upload_media(context.agent.id, image)
 
             # Post reply tweet using tweepy client
-            tweet_params = {
-                "text": text,
-                "user_auth": twitter.use_key,
-                "in_reply_to_tweet_id": tweet_id,
-            }
-
-            if media_ids:
-                tweet_params["media_ids"] = media_ids
-
-            response = await client.create_tweet(**tweet_params)
+            response = await client.create_tweet(
+                text=text,
+                user_auth=use_key,
+                in_reply_to_tweet_id=tweet_id,
+                media_ids=media_ids or None,
+            )
 
             if "data" in response and "id" in response["data"]:
                 return response
             else:
-                logger.error(f"Error replying to tweet: {str(response)}")
+                logger.error("Error replying to tweet: %s", response)
                 raise ToolException("Failed to post reply tweet.")
 
         except Exception as e:
-            logger.error(f"Error replying to tweet: {str(e)}")
+            logger.error("Error replying to tweet: %s", e)
             raise type(e)(f"[agent:{context.agent.id}]: {e}") from e
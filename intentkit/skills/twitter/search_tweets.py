@@ -1,11 +1,15 @@
+import asyncio
 import datetime
 import logging
 from typing import Type
 
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
+from tweepy.asynchronous import AsyncClient
 
+from intentkit.abstracts.twitter import TwitterABC
 from intentkit.clients import get_twitter_client
+from intentkit.skills.base import SkillContext
 
 from .base import TwitterBaseTool
 
@@ -14,6 +18,37 @@ logger = logging.getLogger(__name__)
 NAME = "twitter_search_tweets"
 PROMPT = "Search for recent tweets on Twitter using a query keyword."
 
+# Request fields, joined once since tweepy sends list params comma separated
+_EXPANSIONS = ",".join(
+    [
+        "referenced_tweets.id",
+        "referenced_tweets.id.attachments.media_keys",
+        "referenced_tweets.id.author_id",
+        "attachments.media_keys",
+        "author_id",
+    ]
+)
+_TWEET_FIELDS = ",".join(
+    ["created_at", "author_id", "text", "referenced_tweets", "attachments"]
+)
+_USER_FIELDS = ",".join(
+    [
+        "username",
+        "name",
+        "profile_image_url",
+        "description",
+        "public_metrics",
+        "location",
+        "connection_status",
+    ]
+)
+_MEDIA_FIELDS = ",".join(["url", "type", "width", "height"])
+
+# Searches in flight by (agent id, query, max results), so identical calls made
+# at the same time share one request instead of each spending rate limit quota,
+# entries are removed as soon as the search finishes
+_inflight_searches: dict[tuple[str, str, int], asyncio.Task] = {}
+
 
 class TwitterSearchTweetsInput(BaseModel):
     """Input for TwitterSearchTweets tool."""
@@ -47,69 +82,82 @@ class TwitterSearchTweets(TwitterBaseTool):
             )
             client = await twitter.get_client()
 
-            # Check rate limit only when not using OAuth
-            if not twitter.use_key:
-                await self.check_rate_limit(
-                    context.agent.id, max_requests=3, interval=60 * 24
+            key = (context.agent.id, query, max_results)
+            search = _inflight_searches.get(key)
+            if search is None:
+                search = asyncio.create_task(
+                    self._search(config, context, twitter, client, query, max_results)
                 )
+                _inflight_searches[key] = search
+                search.add_done_callback(lambda _: _inflight_searches.pop(key, None))
+            # shielded so a cancelled caller does not cancel the search for the others
+            return await asyncio.shield(search)
 
-            # Get since_id from store to avoid duplicate results
-            last = await self.skill_store.get_agent_skill_data(
-                context.agent.id, self.name, query
-            )
-            last = last or {}
-            since_id = last.get("since_id")
-
-            # Reset since_id if the saved timestamp is over 6 days old
-            if since_id and last.get("timestamp"):
-                try:
-                    saved_time = datetime.datetime.fromisoformat(last["timestamp"])
-                    if (datetime.datetime.now() - saved_time).days > 6:
-                        since_id = None
-                except (ValueError, TypeError):
-                    since_id = None
+        except Exception as e:
+            logger.error("Error searching tweets: %s", e)
+            raise type(e)(f"[agent:{context.agent.id}]: {e}") from e
 
-            tweets = await client.search_recent_tweets(
-                query=query,
-                user_auth=twitter.use_key,
-                since_id=since_id,
-                max_results=max_results,
-                expansions=[
-                    "referenced_tweets.id",
-                    "referenced_tweets.id.attachments.media_keys",
-                    "referenced_tweets.id.author_id",
-                    "attachments.media_keys",
-                    "author_id",
-                ],
-                tweet_fields=[
-                    "created_at",
-                    "author_id",
-                    "text",
-                    "referenced_tweets",
-                    "attachments",
-                ],
-                user_fields=[
-                    "username",
-                    "name",
-                    "profile_image_url",
-                    "description",
-                    "public_metrics",
-                    "location",
-                    "connection_status",
-                ],
-                media_fields=["url", "type", "width", "height"],
+    async def _search(
+        self,
+        config: RunnableConfig,
+        context: SkillContext,
+        twitter: TwitterABC,
+        client: AsyncClient,
+        query: str,
+        max_results: int,
+    ) -> dict:
+        """Search recent tweets and store the newest id for the next search.
+
+        Args:
+            config: The runnable config of the calling run.
+            context: The skill context.
+            twitter: The Twitter client wrapper of the agent.
+            client: The tweepy client.
+            query: The search query.
+            max_results: Max number of tweets to return.
+
+        Returns:
+            dict: The search response.
+        """
+        # Check rate limit only when not using OAuth
+        if not twitter.use_key:
+            await self.check_rate_limit(
+                context.agent.id, max_requests=3, interval=60 * 24
             )
 
-            # Update the since_id in store for the next request
-            if tweets.get("meta") and tweets.get("meta").get("newest_id"):
-                last["since_id"] = tweets["meta"]["newest_id"]
-                last["timestamp"] = datetime.datetime.now().isoformat()
-                await self.skill_store.save_agent_skill_data(
-                    context.agent.id, self.name, query, last
-                )
+        # Get since_id from store to avoid duplicate results
+        last = await self.get_run_skill_data(config, context.agent.id, self.name, query)
+        last = last or {}
+        since_id = last.get("since_id")
 
-            return tweets
+        # Reset since_id if the saved timestamp is over 6 days old
+        if since_id and last.get("timestamp"):
+            try:
+                saved_time = datetime.datetime.fromisoformat(last["timestamp"])
+                if (datetime.datetime.now() - saved_time).days > 6:
+                    since_id = None
+            except (ValueError, TypeError):
+                since_id = None
+
+        tweets = await client.search_recent_tweets(
+            query=query,
+            user_auth=twitter.use_key,
+            since_id=since_id,
+            max_results=max_results,
+            expansions=_EXPANSIONS,
+            tweet_fields=_TWEET_FIELDS,
+            user_fields=_USER_FIELDS,
+            media_fields=_MEDIA_FIELDS,
+        )
+
+        # Update the since_id in store for the next request, unless
+        # nothing newer came back
+        newest_id = (tweets.get("meta") or {}).get("newest_id")
+        if newest_id and newest_id != since_id:
+            last["since_id"] = newest_id
+            last["timestamp"] = datetime.datetime.now().isoformat()
+            await self.save_run_skill_data(
+                config, context.agent.id, self.name, query, last
+            )
 
-        except Exception as e:
-            logger.error(f"Error searching tweets: {str(e)}")
-            raise type(e)(f"[agent:{context.agent.id}]: {e}") from e
+        return tweets
@@ -1,7 +1,10 @@
+import hashlib
 import logging
+import time
 from typing import Optional
 
 import jwt
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
@@ -9,6 +12,39 @@ logger = logging.getLogger(__name__)
 
 security = HTTPBearer(auto_error=False)
 
+# How long a verified token is trusted without re-checking the signature
+_JWT_CACHE_TTL = 30
+_JWT_CACHE_SIZE = 10000
+
+
+def _decode_cached(token: str, jwt_secret: str, token_cache: TTLCache) -> str:
+    """Decode a JWT and return its subject, reusing recent verification results.
+
+    The cache is keyed by sha256 of the raw token, so tokens are never kept as
+    dictionary keys. Each entry stores (subject, expires_at), where expires_at is
+    the earlier of the cache TTL and the token's own exp claim.
+
+    Raises:
+        jwt.InvalidTokenError: If the token is invalid
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    now = time.time()
+    cached = token_cache.get(key)
+    if cached is not None:
+        subject, expires_at = cached
+        if now < expires_at:
+            return subject
+        token_cache.pop(key, None)
+
+    payload = jwt.decode(token, jwt_secret, algorithms=["HS256"])
+    subject = payload.get("sub", "")
+    expires_at = now + _JWT_CACHE_TTL
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, exp)
+    token_cache[key] = (subject, expires_at)
+    return subject
+
 
 def create_jwt_middleware(enable: bool, jwt_secret: str):
     """Create a JWT verification middleware with configurable enable flag and secret.
@@ -20,6 +56,9 @@ def create_jwt_middleware(enable: bool, jwt_secret: str):
     Returns:
         A middleware function that can be used with FastAPI dependencies
     """
+    # Each middleware has its own cache, so a token verified with one secret
+    # is never accepted by a middleware configured with another.
+    token_cache: TTLCache = TTLCache(maxsize=_JWT_CACHE_SIZE, ttl=_JWT_CACHE_TTL)
 
     async def verify_jwt(
         request: Request,
@@ -51,10 +90,7 @@ def create_jwt_middleware(enable: bool, jwt_secret: str):
             )
 
         try:
-            payload = jwt.decode(
-                credentials.credentials, jwt_secret, algorithms=["HS256"]
-            )
-            return payload.get("sub", "")
+            return _decode_cached(credentials.credentials, jwt_secret, token_cache)
         except jwt.InvalidTokenError:
             raise HTTPException(status_code=401, detail="Invalid authentication token")
 
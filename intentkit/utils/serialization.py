@@ -0,0 +1,22 @@
+import json
+from typing import Any
+
+import orjson
+
+
+def json_dumps(value: Any) -> bytes:
+    """Encode a value as JSON with orjson, falling back to the stdlib encoder.
+
+    orjson rejects integers outside the 64-bit range, which the stdlib accepts,
+    and wei amounts in skill calls often exceed it.
+
+    Args:
+        value: The value to encode.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON.
+    """
+    try:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
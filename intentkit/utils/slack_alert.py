@@ -7,6 +7,7 @@ from typing import Optional
 
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,7 @@ logger = logging.getLogger(__name__)
 _slack_token: Optional[str] = None
 _slack_channel: Optional[str] = None
 _slack_client: Optional[WebClient] = None
+_slack_async_client: Optional[AsyncWebClient] = None
 
 
 def init_slack(token: str, channel: str) -> None:
@@ -28,10 +30,11 @@ def init_slack(token: str, channel: str) -> None:
         ValueError: If token or channel is empty
     """
 
-    global _slack_token, _slack_channel, _slack_client
+    global _slack_token, _slack_channel, _slack_client, _slack_async_client
     _slack_token = token
     _slack_channel = channel
     _slack_client = WebClient(token=token)
+    _slack_async_client = AsyncWebClient(token=token)
 
 
 def send_slack_message(
@@ -77,3 +80,44 @@ def send_slack_message(
         return response
     except SlackApiError as e:
         logger.error(f"Failed to send Slack message: {str(e)}")
+
+
+async def send_slack_message_async(
+    message: str,
+    blocks: Optional[list] = None,
+    attachments: Optional[list] = None,
+    thread_ts: Optional[str] = None,
+    channel: Optional[str] = None,
+):
+    """
+    Send a message to a Slack channel without blocking the event loop.
+
+    Args:
+        message: The message text to send
+        blocks: Optional blocks for rich message formatting (see Slack Block Kit)
+        attachments: Optional attachments for the message
+        thread_ts: Optional thread timestamp to reply to a thread
+        channel: Optional channel override. If not provided, uses the default channel
+    """
+    if not _slack_async_client or not _slack_channel:
+        # Write the input message to the log and return
+        logger.info("Slack not initialized")
+        logger.info(message)
+        if blocks:
+            logger.info(blocks)
+        if attachments:
+            logger.info(attachments)
+        return
+
+    try:
+        response = await _slack_async_client.chat_postMessage(
+            channel=channel or _slack_channel,
+            text=message,
+            blocks=blocks,
+            attachments=attachments,
+            thread_ts=thread_ts,
+        )
+        logger.info(f"Message sent successfully to channel {channel or _slack_channel}")
+        return response
+    except SlackApiError as e:
+        logger.error(f"Failed to send Slack message: {str(e)}")